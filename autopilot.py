@@ -0,0 +1,221 @@
+import heapq
+import time
+from collections import deque
+
+from engine import DIRECTIONS, HamiltonianCycle, direction_between
+
+
+class Autopilot:
+    """Steers a SnakeEngine toward the food along a Hamiltonian cycle of the board.
+
+    Following the cycle alone can never crash, so it is the safety net. To get
+    to the food sooner the snake takes A* shortcuts, but only ones that keep
+    every new head position ahead of the old head and behind the tail in cycle
+    order, which keeps the body laid out along the cycle. The search only
+    walks cells in that window, so it never finds a shortcut that would be
+    thrown away. After plan_ms it settles for the part of the way it has
+    found and plans the rest from there. Once planned, a path is reused
+    tick after tick and only replanned when the food moves or the next cell
+    on it is blocked. Shortcuts stop once the snake fills half the cycle,
+    after which it simply follows the cycle to the end of the board.
+    """
+
+    def __init__(self, engine, max_nodes=20000, retry_ticks=8, plan_ms=5, clock=time.perf_counter):
+        self.engine = engine
+        self.max_nodes = max_nodes  # Cells counted by room() when escaping
+        self.plan_ms = plan_ms  # Search time per plan, keeps big boards inside the tick (None: no limit)
+        self.clock = clock
+        self.retry_ticks = retry_ticks  # Ticks to wait before replanning after no shortcut was usable
+        self.retry_at = 0
+        self.cycle = HamiltonianCycle(engine.width, engine.height, engine.segment_size)
+        self.path = deque()
+        self.path_food = None
+        self.plans = 0
+        self.reuses = 0
+
+    def clear(self):
+        """Drop the cached path, for when the game state was changed from outside (a rewind)."""
+        self.path.clear()
+        self.path_food = None
+        self.retry_at = 0
+
+    def neighbours(self, cell):
+        size = self.engine.segment_size
+        for dx, dy in DIRECTIONS.values():
+            yield (cell[0] + dx * size, cell[1] + dy * size)
+
+    def is_free(self, cell, blocked):
+        # The autopilot stays on the cycle cells, so they are its whole board
+        return cell not in blocked and self.cycle.index(cell) is not None
+
+    def ahead(self, start, cell):
+        """How many cycle steps cell is ahead of start."""
+        return (self.cycle.index(cell) - self.cycle.index(start)) % len(self.cycle)
+
+    def next_direction(self):
+        engine = self.engine
+        head = engine.snake[-1]
+        head_index = self.cycle.index(head)
+        if head_index is None:
+            return self.escape_direction(head)
+
+        # Reuse the cached path while it still leads to the food and is not blocked
+        if (self.path and self.path_food == engine.food_pos and
+                self.is_free(self.path[0], engine.occupied)):
+            self.reuses += 1
+            return direction_between(head, self.path.popleft(), self.engine.segment_size)
+
+        if self.path_food != engine.food_pos or self.path or engine.tick >= self.retry_at:
+            self.path.clear()
+            self.path_food = engine.food_pos
+            if engine.food_pos is not None and len(engine.snake) * 2 < len(self.cycle):
+                self.plans += 1
+                path = self.find_path(head, engine.food_pos, engine.occupied, engine.snake)
+                if path and self.keeps_cycle_order(path):
+                    self.path.extend(path)
+                    return direction_between(head, self.path.popleft(), self.engine.segment_size)
+                self.retry_at = engine.tick + self.retry_ticks
+
+        # No usable shortcut: take the next cell of the cycle
+        next_cell = self.cycle.cell(head_index + 1)
+        if self.is_free(next_cell, engine.occupied):
+            return direction_between(head, next_cell, self.engine.segment_size)
+        return self.escape_direction(head)
+
+    def find_path(self, start, goal, blocked, snake=None):
+        """A* over free cells; returns the cells after start up to goal, or None.
+
+        With the snake given, only moves forward in cycle order and short of
+        where the tail will be are searched, as keeps_cycle_order wants. When
+        plan_ms runs out first, the path to the cell that got closest to the
+        goal is returned instead (None if that is start), to be followed and
+        then planned on from.
+        """
+        size = self.engine.segment_size
+        cycle = self.cycle
+        start_index = cycle.index(start)
+        cycle_length = len(cycle)
+        if snake is not None:
+            if cycle.index(goal) is None:
+                return None
+            # Moving only forward in cycle order, the goal is at most this many
+            # steps away; if the tail is still in the way by then, there is no path
+            longest = self.ahead(start, goal)
+            if longest + 1 >= self.tail_limit(start, snake, longest - 1):
+                return None
+
+        goal_column = (goal[0] - cycle.left) // size
+        goal_row = (goal[1] - cycle.bottom) // size
+
+        def estimate(cell):
+            column = (cell[0] - cycle.left) // size
+            if snake is not None and column > goal_column + 1:
+                # Going forward, the only way left across more than a column is
+                # the lane along the bottom row
+                return (cell[1] - cycle.bottom) // size + column - goal_column + goal_row
+            return (abs(cell[0] - goal[0]) + abs(cell[1] - goal[1])) // size
+
+        came_from = {start: None}
+        cost = {start: 0}
+        index = cycle.index
+        moves = [(dx * size, dy * size) for dx, dy in DIRECTIONS.values()]
+        # Ties go to the deepest cell, so the search heads straight for the goal;
+        # entries carry how far ahead of start in cycle order the cell is
+        frontier = [(estimate(start), 0, 0, start)]
+        deadline = None if self.plan_ms is None else self.clock() + self.plan_ms / 1000
+        expanded = 0
+        closest = (estimate(start), start)
+        while frontier:
+            _, steps, position, cell = heapq.heappop(frontier)
+            steps = -steps
+            if cell == goal:
+                return self.trace(came_from, start, cell)
+            if steps > cost[cell]:
+                continue
+            expanded += 1
+            closest = min(closest, (estimate(cell), cell))
+            if deadline is not None and expanded % 256 == 0 and self.clock() > deadline:
+                return self.trace(came_from, start, closest[1]) if closest[1] != start else None
+            # Where the tail is when the next cell is entered
+            limit = self.tail_limit(start, snake, steps) if snake is not None else cycle_length + 1
+            for dx, dy in moves:
+                neighbour = (cell[0] + dx, cell[1] + dy)
+                if neighbour in blocked:
+                    continue
+                neighbour_index = index(neighbour)
+                # The autopilot stays on the cycle cells, so they are its whole board
+                if neighbour_index is None:
+                    continue
+                forward = (neighbour_index - start_index) % cycle_length
+                if snake is not None and (forward <= position or forward + 1 >= limit):
+                    continue
+                if steps + 1 < cost.get(neighbour, steps + 2):
+                    cost[neighbour] = steps + 1
+                    came_from[neighbour] = cell
+                    heapq.heappush(frontier, (steps + 1 + estimate(neighbour), -(steps + 1), forward, neighbour))
+        return None
+
+    def trace(self, came_from, start, cell):
+        path = []
+        while cell != start:
+            path.append(cell)
+            cell = came_from[cell]
+        path.reverse()
+        return path
+
+    def tail_limit(self, start, snake, step):
+        """How far ahead of start the tail is when path cell step is entered.
+
+        Once the tail is at start or on the path it trails the head, and the
+        whole cycle is open: the cycle length is returned.
+        """
+        if step >= len(snake) - 1:
+            return len(self.cycle)
+        tail = self.cycle.index(snake[step])
+        return 0 if tail is None else (tail - self.cycle.index(start)) % len(self.cycle)
+
+    def keeps_cycle_order(self, path):
+        """Whether each step of path lands strictly between the current head and tail in cycle order."""
+        snake = self.engine.snake
+        length = len(snake)
+        head = snake[-1]
+        for step, cell in enumerate(path):
+            # The tail has moved step cells on by the time this cell is entered
+            tail = snake[step] if step < length else path[step - length]
+            if self.cycle.index(tail) is None:
+                return False
+            # Leave one spare cell so the tail growing on the last step cannot be hit
+            if self.ahead(head, cell) + 1 >= self.ahead(head, tail):
+                return False
+            head = cell
+        return True
+
+    def escape_direction(self, head):
+        """Off the cycle (e.g. switched on mid-game): move toward the most open neighbour."""
+        engine = self.engine
+        best = None
+        for neighbour in self.neighbours(head):
+            if neighbour in engine.occupied or not self.in_bounds(neighbour):
+                continue
+            room = self.room(neighbour, engine.occupied)
+            if best is None or room > best[0]:
+                best = (room, neighbour)
+        if best is None:
+            return engine.direction
+        return direction_between(head, best[1], self.engine.segment_size)
+
+    def in_bounds(self, cell):
+        engine = self.engine
+        return -engine.width/2 <= cell[0] <= engine.width/2 and -engine.height/2 <= cell[1] <= engine.height/2
+
+    def room(self, start, blocked):
+        """Number of free cells reachable from start, capped at max_nodes."""
+        seen = {start}
+        queue = deque([start])
+        while queue and len(seen) < self.max_nodes:
+            cell = queue.popleft()
+            for neighbour in self.neighbours(cell):
+                if neighbour not in seen and neighbour not in blocked and self.in_bounds(neighbour):
+                    seen.add(neighbour)
+                    queue.append(neighbour)
+        return len(seen)
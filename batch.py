@@ -0,0 +1,191 @@
+"""Run many seeded headless games across processes and aggregate the results.
+
+    python batch.py --games 10000 --bots autopilot,random --boards 400x300,800x600
+    python batch.py --games 100000 --jsonl results.jsonl --workers 8
+
+Results stream back as games finish. Only running aggregates are kept in
+memory (plus at most max_pending chunks in flight), so sweeps of any length
+run in bounded memory. Per-game rows can be streamed to a JSON lines file.
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from autopilot import Autopilot
+from engine import DIRECTIONS, OPPOSITES, SnakeEngine
+
+
+def autopilot_bot(engine, seed):
+    # No time limit on planning, so a seed plays the same game on any machine
+    return Autopilot(engine, plan_ms=None).next_direction
+
+
+def random_bot(engine, seed):
+    rng = random.Random(seed)
+    directions = list(DIRECTIONS)
+
+    def choose():
+        # Keep going straight most of the time, never reverse into the neck
+        if rng.random() < 0.8:
+            return engine.direction
+        return rng.choice([d for d in directions if d != OPPOSITES[engine.direction]])
+    return choose
+
+
+BOTS = {
+    "autopilot": autopilot_bot,
+    "random": random_bot
+}
+
+
+def play_game(bot, board, seed, max_ticks):
+    width, height = map(int, board.split("x"))
+    engine = SnakeEngine(width, height)
+    engine.reset(seed)
+    choose = BOTS[bot](engine, seed)
+    while not engine.done and engine.tick < max_ticks:
+        engine.step(choose())
+    return {
+        "bot": bot,
+        "board": board,
+        "seed": seed,
+        "score": engine.score,
+        "length": len(engine.snake),
+        "ticks": engine.tick,
+        "cause": engine.death_cause or "timeout"
+    }
+
+
+def play_games(jobs):
+    return [play_game(*job) for job in jobs]
+
+
+def make_jobs(games, bots, boards, seed, max_ticks):
+    """Every bot plays every board on the same seeds, generated lazily."""
+    for i in range(games):
+        for board in boards:
+            for bot in bots:
+                yield (bot, board, seed + i, max_ticks)
+
+
+def run_batch(jobs, workers=None, chunk_size=32, max_pending=None):
+    """Yield game results as they finish, keeping at most max_pending chunks in flight."""
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 4
+    jobs = iter(jobs)
+    with ProcessPoolExecutor(workers) as pool:
+        pending = set()
+        while True:
+            while len(pending) < max_pending:
+                chunk = list(itertools.islice(jobs, chunk_size))
+                if not chunk:
+                    break
+                pending.add(pool.submit(play_games, chunk))
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+class RunningStats:
+    """Count, mean, spread and range of a stream of numbers (Welford's method)."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def summary(self):
+        return {
+            "mean": round(self.mean, 3),
+            "stdev": round(math.sqrt(self.m2 / self.count), 3) if self.count else 0.0,
+            "min": self.min,
+            "max": self.max
+        }
+
+
+class BatchSummary:
+    """Aggregates results per (bot, board) without keeping the individual games."""
+
+    FIELDS = ["score", "length", "ticks"]
+
+    def __init__(self):
+        self.groups = {}
+
+    def add(self, result):
+        key = (result["bot"], result["board"])
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = {
+                "games": 0,
+                "causes": {},
+                "stats": {field: RunningStats() for field in self.FIELDS}
+            }
+        group["games"] += 1
+        group["causes"][result["cause"]] = group["causes"].get(result["cause"], 0) + 1
+        for field in self.FIELDS:
+            group["stats"][field].add(result[field])
+
+    def report(self):
+        return [
+            dict({"bot": bot, "board": board, "games": group["games"], "causes": group["causes"]},
+                 **{field: stats.summary() for field, stats in group["stats"].items()})
+            for (bot, board), group in sorted(self.groups.items())
+        ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=1000, help="seeds per bot and board")
+    parser.add_argument("--bots", default="autopilot,random")
+    parser.add_argument("--boards", default="800x600")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-ticks", type=int, default=50000)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--chunk-size", type=int, default=32)
+    parser.add_argument("--jsonl", help="also stream every game result to this file")
+    args = parser.parse_args(argv)
+
+    bots = args.bots.split(",")
+    for bot in bots:
+        if bot not in BOTS:
+            parser.error(f"unknown bot {bot!r}, choose from {', '.join(BOTS)}")
+    boards = args.boards.split(",")
+    total = args.games * len(bots) * len(boards)
+
+    summary = BatchSummary()
+    out = open(args.jsonl, "w") if args.jsonl else None
+    try:
+        jobs = make_jobs(args.games, bots, boards, args.seed, args.max_ticks)
+        for finished, result in enumerate(run_batch(jobs, args.workers, args.chunk_size), 1):
+            summary.add(result)
+            if out:
+                out.write(json.dumps(result) + "\n")
+            if finished % 100 == 0 or finished == total:
+                print(f"\r{finished}/{total} games", end="", file=sys.stderr)
+    finally:
+        if out:
+            out.close()
+    print(file=sys.stderr)
+    json.dump(summary.report(), sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
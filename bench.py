@@ -0,0 +1,313 @@
+"""Deterministic benchmarks for the tick logic and the turtle renderers.
+
+    python bench.py                         # logic only, JSON on stdout
+    python bench.py --render -o bench.json  # also time app.py and v2.py drawing
+    xvfb-run python bench.py --render       # rendering on a virtual display
+
+Every case pre-builds a snake of the given length along a Hamiltonian cycle of
+the board and then follows that cycle, so runs are seeded, never die and can be
+diffed between commits.
+
+With --render each variant is also left running for --idle-seconds waiting to
+start, paused and playing on autopilot, and the CPU it used and the timer
+callbacks it woke up for are reported per state. Waiting and paused should
+be close to zero on both. Each variant and renderer also plays rounds of
+overlapping food pulses on moving food, and the run fails if the number of
+canvas items left after a round keeps growing.
+"""
+import argparse
+import importlib
+import json
+import platform
+import subprocess
+import sys
+import time
+
+from engine import SnakeEngine, direction_between, hamiltonian_cycle
+
+VARIANTS = ["app", "v2"]
+DEFAULT_LENGTHS = [3, 10, 100, 500, 1000, 2000]
+DEFAULT_BOARDS = ["800x600", "1600x1200", "4000x3000"]
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def summarize(name, samples, **labels):
+    samples = sorted(samples)
+    total = sum(samples)
+    return dict(labels, **{
+        "phase": name,
+        "ticks": len(samples),
+        "ticks_per_sec": round(len(samples) / total, 1) if total else None,
+        "mean_us": round(total / len(samples) * 1e6, 3),
+        "p50_us": round(percentile(samples, 0.50) * 1e6, 3),
+        "p99_us": round(percentile(samples, 0.99) * 1e6, 3)
+    })
+
+
+def build_snake(engine, length):
+    """Lay a snake of the given length along the board cycle; returns the cycle and the head index."""
+    cycle = hamiltonian_cycle(engine.width, engine.height, engine.segment_size)
+    if length >= len(cycle):
+        return None, None
+    head = length - 1
+    engine.set_snake(cycle[:length], direction_between(cycle[head], cycle[head + 1], engine.segment_size))
+    return cycle, head
+
+
+def follow_cycle(engine, cycle, head):
+    """Direction that keeps the head on the cycle, plus the new head index."""
+    head_cell = engine.snake[-1]
+    if cycle[head] != head_cell:
+        head = cycle.index(head_cell)
+    next_head = (head + 1) % len(cycle)
+    return direction_between(cycle[head], cycle[next_head], engine.segment_size), next_head
+
+
+def bench_logic(board, length, ticks, seed):
+    width, height = map(int, board.split("x"))
+    engine = SnakeEngine(width, height, seed=seed)
+    cycle, head = build_snake(engine, length)
+    if cycle is None:
+        return []
+
+    clock = time.perf_counter
+    step_samples = []
+    for _ in range(ticks):
+        direction, head = follow_cycle(engine, cycle, head)
+        start = clock()
+        engine.step(direction)
+        step_samples.append(clock() - start)
+        if engine.done:
+            cycle, head = build_snake(engine, length)
+
+    food_samples = []
+    for _ in range(ticks):
+        start = clock()
+        engine.random_food_pos()
+        food_samples.append(clock() - start)
+
+    labels = {"variant": "engine", "board": board, "length": length}
+    return [summarize("step", step_samples, **labels), summarize("food_pos", food_samples, **labels)]
+
+
+def bench_render(variant, lengths, ticks, seed):
+    """Time a variant's move_snake/draw_snake/update_food_color on a real Tk screen."""
+    module = importlib.import_module(variant)
+    game = module.SnakeGame()
+    game.engine.rng.seed(seed)
+    game.game_started = True
+    board = f"{module.WIDTH}x{module.HEIGHT}"
+    clock = time.perf_counter
+    results = []
+
+    for length in lengths:
+        cycle, head = build_snake(game.engine, length)
+        if cycle is None:
+            continue
+        game.draw_snake()
+        game.display.update()
+
+        phases = {"move_snake": [], "draw_snake": [], "screen_update": []}
+        if hasattr(game, "update_food_color"):
+            phases["update_food_color"] = []
+        for _ in range(ticks):
+            game.snake_direction, head = follow_cycle(game.engine, cycle, head)
+
+            start = clock()
+            game.move_snake()
+            phases["move_snake"].append(clock() - start)
+
+            start = clock()
+            game.draw_snake()
+            phases["draw_snake"].append(clock() - start)
+
+            start = clock()
+            game.display.update()
+            phases["screen_update"].append(clock() - start)
+
+            if "update_food_color" in phases:
+                start = clock()
+                game.update_food_color()
+                phases["update_food_color"].append(clock() - start)
+
+            if not game.game_started or game.engine.done:
+                game.game_started = True
+                cycle, head = build_snake(game.engine, length)
+
+        labels = {"variant": variant, "board": board, "length": length}
+        results.extend(summarize(name, samples, **labels) for name, samples in phases.items())
+    return results
+
+
+def bench_idle(variant, seconds):
+    """CPU use and timer wakeups of a variant's real main loop while waiting, paused and playing."""
+    module = importlib.import_module(variant)
+    game = module.SnakeGame()
+    # The playing snake must not die, or the game would go back to waiting
+    game.autopilot = module.Autopilot(game.engine)
+    canvas = game.display.screen.getcanvas()
+    wakeups = [0]
+
+    def counted(schedule):
+        def wrapper(callback, ms):
+            def wake():
+                wakeups[0] += 1
+                callback()
+            schedule(wake, ms)
+        return wrapper
+
+    # The scheduler holds its own reference to ontimer, so both are wrapped
+    game.display.ontimer = counted(game.display.ontimer)
+    game.scheduler.schedule = counted(game.scheduler.schedule)
+
+    def measure(state):
+        wakeups[0] = 0
+        wall, cpu = time.perf_counter(), time.process_time()
+        canvas.after(round(seconds * 1000), canvas.quit)
+        canvas.mainloop()
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        return {
+            "variant": variant,
+            "state": state,
+            "seconds": round(wall, 3),
+            "cpu_percent": round(cpu / wall * 100, 2),
+            "wakeups_per_sec": round(wakeups[0] / wall, 1)
+        }
+
+    results = [measure("waiting")]
+    game.start_game()
+    game.toggle_pause()
+    results.append(measure("paused"))
+    game.toggle_pause()
+    results.append(measure("playing"))
+    return results
+
+
+def bench_soak(variant, renderer, rounds, pulses=8):
+    """Canvas items left after each round of pulses plays out; more than after the first is a leak."""
+    module = importlib.import_module(variant)
+    game = module.SnakeGame(renderer=renderer)
+    now = [0.0]
+    game.scheduler.clock = lambda: now[0]
+    game.draw_snake()
+    counts = []
+    for _ in range(rounds):
+        # More pulses than the effect budget, 0.1 s apart so they overlap
+        for _ in range(pulses):
+            game.engine.food_pos = game.engine.random_food_pos()
+            game.place_food()
+            game.spawn_food_effect()
+            for _ in range(2):
+                now[0] += 0.05
+                if hasattr(game, "update_food_color"):
+                    game.update_food_color()
+                game.draw_effects()
+                game.display.update()
+        while game.effects:
+            now[0] += 0.05
+            game.draw_effects()
+        game.display.update()
+        counts.append(game.display.item_count())
+    return [{
+        "variant": variant,
+        "renderer": renderer,
+        "phase": "effects_soak",
+        "pulses": rounds * pulses,
+        "items_first": counts[0],
+        "items_last": counts[-1],
+        "items_max": max(counts),
+        "flat": max(counts) == counts[0]
+    }]
+
+
+def run_render_worker(variant, lengths, ticks, seed):
+    """Each variant owns the turtle Screen singleton, so it is timed in its own process."""
+    command = [sys.executable, __file__, "--render-worker", variant, "--ticks", str(ticks),
+               "--seed", str(seed), "--lengths", ",".join(map(str, lengths))]
+    return run_worker(variant, command)
+
+
+def run_idle_worker(variant, seconds):
+    command = [sys.executable, __file__, "--idle-worker", variant, "--idle-seconds", str(seconds)]
+    return run_worker(variant, command)
+
+
+def run_soak_worker(variant, renderer, rounds):
+    command = [sys.executable, __file__, "--soak-worker", variant, "--soak-renderer", renderer,
+               "--soak-rounds", str(rounds)]
+    return run_worker(variant, command)
+
+
+def run_worker(variant, command):
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()
+        return [{"variant": variant, "skipped": error[-1] if error else "render worker failed"}]
+    return json.loads(completed.stdout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lengths", default=",".join(map(str, DEFAULT_LENGTHS)))
+    parser.add_argument("--boards", default=",".join(DEFAULT_BOARDS))
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--variants", default=",".join(VARIANTS))
+    parser.add_argument("--render", action="store_true", help="also time drawing (needs a display)")
+    parser.add_argument("-o", "--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--idle-seconds", type=float, default=3.0, help="time in each idle state (default: 3)")
+    parser.add_argument("--soak-rounds", type=int, default=50, help="rounds of food pulses in the soak check (default: 50)")
+    parser.add_argument("--render-worker", help=argparse.SUPPRESS)
+    parser.add_argument("--soak-worker", help=argparse.SUPPRESS)
+    parser.add_argument("--soak-renderer", default="turtle", help=argparse.SUPPRESS)
+    parser.add_argument("--idle-worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    lengths = [int(length) for length in args.lengths.split(",")]
+
+    if args.render_worker:
+        json.dump(bench_render(args.render_worker, lengths, args.ticks, args.seed), sys.stdout)
+        return
+    if args.idle_worker:
+        json.dump(bench_idle(args.idle_worker, args.idle_seconds), sys.stdout)
+        return
+    if args.soak_worker:
+        json.dump(bench_soak(args.soak_worker, args.soak_renderer, args.soak_rounds), sys.stdout)
+        return
+
+    results = []
+    for board in args.boards.split(","):
+        for length in lengths:
+            results.extend(bench_logic(board, length, args.ticks, args.seed))
+    if args.render:
+        for variant in args.variants.split(","):
+            results.extend(run_render_worker(variant, lengths, args.ticks, args.seed))
+            results.extend(run_idle_worker(variant, args.idle_seconds))
+            for renderer in ("turtle", "canvas"):
+                results.extend(run_soak_worker(variant, renderer, args.soak_rounds))
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "ticks": args.ticks
+        },
+        "results": results
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    leaks = [row for row in results if row.get("flat") is False]
+    if leaks:
+        sys.exit("canvas items kept growing in the soak check: " +
+                 ", ".join(f"{row['variant']}/{row['renderer']}" for row in leaks))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""Thin client for server.py: renders the shared board with the turtle UI, or loads the server.
+
+    python client.py --host 127.0.0.1 --port 8765
+    python client.py --load 200 --seconds 30
+
+The client keeps no game rules. It rebuilds the board from the server's
+messages (see server.py for the protocol) and sends its turns.
+"""
+import argparse
+import asyncio
+import json
+import queue
+import random
+import socket
+import sys
+import threading
+import turtle
+from collections import deque
+
+from app import FOOD_SIZE, HEIGHT, WIDTH, SnakeGame
+from colors import ColorCache, HUE_STEPS, hsv_hex
+from engine import DIRECTIONS
+from renderers import Camera, SnakeStampRenderer, draw_background_grid
+from server import encode
+
+
+class RemoteSnake:
+    """A snake from the server, laid out like SnakeEngine.snake/occupied so the renderers can draw it."""
+
+    def __init__(self, cells):
+        self.snake = deque()
+        self.occupied = {}
+        self.next_seq = 0
+        for cell in cells:
+            self.add_head(tuple(cell))
+
+    def add_head(self, cell):
+        self.snake.append(cell)
+        self.occupied[cell] = self.next_seq
+        self.next_seq += 1
+
+    def remove_tail(self):
+        del self.occupied[self.snake.popleft()]
+
+
+class RemoteState:
+    """The board rebuilt from the server's snapshot and tick deltas."""
+
+    def __init__(self, welcome):
+        self.id = welcome["id"]
+        self.width = welcome["width"]
+        self.height = welcome["height"]
+        self.segment_size = welcome["segment_size"]
+        self.tick = 0
+        self.snakes = {}
+        self.food = []
+        self.scores = {}
+        self.food_changed = False
+
+    def apply(self, message):
+        if message["type"] == "snapshot":
+            self.snakes = {int(snake_id): RemoteSnake(cells) for snake_id, cells in message["snakes"].items()}
+            self.food = [tuple(cell) if cell else None for cell in message["food"]]
+            self.scores = {int(snake_id): score for snake_id, score in message["scores"].items()}
+            self.food_changed = True
+        elif message["type"] == "tick":
+            for snake_id in message["dead"]:
+                self.snakes.pop(snake_id, None)
+            for snake_id, x, y in message["heads"]:
+                self.snakes[snake_id].add_head((x, y))
+            for snake_id in message["tails"]:
+                self.snakes[snake_id].remove_tail()
+            for slot, x, y in message["food"]:
+                self.food[slot] = (x, y) if x is not None else None
+                self.food_changed = True
+            for snake_id, cells in message["spawn"].items():
+                self.snakes[int(snake_id)] = RemoteSnake(cells)
+            for snake_id, score in message["scores"].items():
+                self.scores[int(snake_id)] = score
+        self.tick = message.get("tick", self.tick)
+
+
+class Connection:
+    """Socket to the server, read on a background thread so the Tk loop never blocks on it."""
+
+    def __init__(self, host, port):
+        self.sock = socket.create_connection((host, port))
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.file = self.sock.makefile("rb")
+        self.welcome = json.loads(self.file.readline())
+        self.messages = queue.SimpleQueue()
+        threading.Thread(target=self.read, daemon=True).start()
+
+    def read(self):
+        try:
+            for line in self.file:
+                self.messages.put(json.loads(line))
+        except OSError:
+            pass
+        # None tells the UI the server went away
+        self.messages.put(None)
+
+    def send(self, message):
+        try:
+            self.sock.sendall(encode(message))
+        except OSError:
+            pass
+
+
+class RemoteGame:
+    # The player's own snake gets the same gradient as the local game
+    interpolate_color = SnakeGame.interpolate_color
+    compute_segment_color = SnakeGame.compute_segment_color
+    get_segment_color = SnakeGame.get_segment_color
+
+    def __init__(self, host, port, poll_ms=10):
+        self.connection = Connection(host, port)
+        self.state = RemoteState(self.connection.welcome)
+        self.poll_ms = poll_ms
+        self.color_cache = ColorCache()
+        self.camera = Camera(WIDTH, HEIGHT, self.state.width, self.state.height, self.state.segment_size)
+        self.drawn = {}
+        self.spare_pens = []
+        self.score_text = None
+        self.message = None
+        self.connected = True
+
+        self.screen = turtle.Screen()
+        self.screen.setup(WIDTH, HEIGHT)
+        self.screen.title("Neon Snake (online)")
+        self.screen.bgcolor("#1a1a1a")
+        self.screen.tracer(0)
+        draw_background_grid(self.screen.getcanvas(), WIDTH, HEIGHT, 40, "#2c3e50")
+
+        self.food_pen = self.make_pen("circle")
+        self.food_pen.color("#e74c3c")
+        self.food_pen.shapesize(FOOD_SIZE/20)
+        self.score_display = self.make_pen()
+        self.score_display.color("#ecf0f1")
+        self.score_display.goto(0, HEIGHT/2 - 40)
+        self.message_display = self.make_pen()
+        self.message_display.color("#ecf0f1")
+
+        self.screen.listen()
+        for key, direction in (("Up", "up"), ("Down", "down"), ("Left", "left"), ("Right", "right")):
+            self.screen.onkey(lambda direction=direction: self.connection.send({"dir": direction}), key)
+        self.poll()
+
+    def make_pen(self, shape="square"):
+        pen = turtle.Turtle()
+        pen.penup()
+        pen.shape(shape)
+        pen.hideturtle()
+        return pen
+
+    def other_color(self, snake_id):
+        # Every other player gets one flat color of its own
+        hue_step = round((snake_id * 0.618034) % 1 * HUE_STEPS)
+        color = self.color_cache.get(("other", hue_step), hsv_hex, hue_step / HUE_STEPS, 0.45, 0.75)
+        return lambda index, total: color
+
+    def poll(self):
+        changed = False
+        while self.connected:
+            try:
+                message = self.connection.messages.get_nowait()
+            except queue.Empty:
+                break
+            if message is None:
+                self.connected = False
+                self.show_message("Disconnected from server", "#e74c3c")
+            else:
+                self.state.apply(message)
+                changed = True
+        if changed:
+            self.render()
+        if self.connected:
+            turtle.ontimer(self.poll, self.poll_ms)
+
+    def render(self):
+        state = self.state
+        me = state.snakes.get(state.id)
+        if me is not None and self.camera.follow(me.snake[-1]):
+            state.food_changed = True
+
+        # Drop renderers of snakes that died or left, add ones for new snakes
+        for snake_id, (remote, renderer) in list(self.drawn.items()):
+            if state.snakes.get(snake_id) is not remote:
+                renderer.clear()
+                self.spare_pens.append(renderer.pen)
+                del self.drawn[snake_id]
+        for snake_id, remote in state.snakes.items():
+            if snake_id not in self.drawn:
+                pen = self.spare_pens.pop() if self.spare_pens else self.make_pen()
+                color_func = self.get_segment_color if snake_id == state.id else self.other_color(snake_id)
+                self.drawn[snake_id] = (remote, SnakeStampRenderer(pen, color_func, self.camera))
+        for remote, renderer in self.drawn.values():
+            renderer.draw(remote.snake, remote.occupied)
+
+        if state.food_changed:
+            self.food_pen.clearstamps()
+            for cell in state.food:
+                if cell is not None and self.camera.visible(cell):
+                    self.food_pen.goto(self.camera.to_screen(cell))
+                    self.food_pen.stamp()
+            state.food_changed = False
+
+        text = f"Score: {state.scores.get(state.id, 0)}  |  Players: {len(state.snakes)}"
+        if text != self.score_text:
+            self.score_text = text
+            self.score_display.clear()
+            self.score_display.write(text, align="center", font=("Arial", 16, "bold"))
+        if me is None:
+            self.show_message("Waiting to respawn...", "#f1c40f")
+        else:
+            self.show_message(None)
+        self.screen.update()
+
+    def show_message(self, message, color="#ecf0f1"):
+        if message == self.message:
+            return
+        self.message = message
+        self.message_display.clear()
+        if message:
+            self.message_display.color(color)
+            self.message_display.write(message, align="center", font=("Arial", 20, "bold"))
+
+
+async def load_client(host, port, seconds, rng, gaps):
+    """One headless player turning at random; records the gap between tick messages."""
+    loop = asyncio.get_running_loop()
+    reader, writer = await asyncio.open_connection(host, port)
+    directions = list(DIRECTIONS)
+    end = loop.time() + seconds
+    last = None
+    while loop.time() < end:
+        line = await reader.readline()
+        if not line:
+            break
+        # Only the arrival time matters here, so the delta is not parsed
+        if line.startswith(b'{"type":"tick"'):
+            now = loop.time()
+            if last is not None:
+                gaps.append(now - last)
+            last = now
+            if rng.random() < 0.2:
+                writer.write(encode({"dir": rng.choice(directions)}))
+    writer.close()
+
+
+async def run_load(host, port, clients, seconds, seed=None):
+    rng = random.Random(seed)
+    gaps = []
+    await asyncio.gather(*(load_client(host, port, seconds, random.Random(rng.random()), gaps)
+                           for _ in range(clients)))
+    gaps.sort()
+    if not gaps:
+        return {"clients": clients, "ticks": 0}
+    return {
+        "clients": clients,
+        "ticks": len(gaps),
+        "gap_p50_ms": round(gaps[len(gaps) // 2] * 1000, 3),
+        "gap_p99_ms": round(gaps[min(len(gaps) - 1, int(len(gaps) * 0.99))] * 1000, 3),
+        "gap_max_ms": round(gaps[-1] * 1000, 3)
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--load", type=int, metavar="N", help="run N headless clients instead of the UI")
+    parser.add_argument("--seconds", type=float, default=10.0, help="how long the headless clients play")
+    args = parser.parse_args(argv)
+
+    if args.load:
+        report = asyncio.run(run_load(args.host, args.port, args.load, args.seconds))
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        return
+    RemoteGame(args.host, args.port)
+    turtle.done()
+
+
+if __name__ == "__main__":
+    main()
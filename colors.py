@@ -0,0 +1,53 @@
+import colorsys
+from collections import OrderedDict
+
+# Resolution of the cache keys: gradient positions and hues are snapped to these many steps
+GRADIENT_STEPS = 1024
+HUE_STEPS = 1000
+
+
+def rgb_hex(rgb):
+    return f"#{int(rgb[0]):02x}{int(rgb[1]):02x}{int(rgb[2]):02x}"
+
+
+def hsv_hex(hue, saturation, value):
+    rgb = colorsys.hsv_to_rgb(hue, saturation, value)
+    return f"#{int(rgb[0]*255):02x}{int(rgb[1]*255):02x}{int(rgb[2]*255):02x}"
+
+
+class ColorCache:
+    """Bounded LRU cache of computed color strings with hit/miss counters."""
+
+    def __init__(self, max_size=4096):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, compute, *args):
+        entries = self.entries
+        color = entries.get(key)
+        if color is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return color
+
+        self.misses += 1
+        color = entries[key] = compute(*args)
+        if len(entries) > self.max_size:
+            entries.popitem(last=False)
+        return color
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
@@ -0,0 +1,55 @@
+import time
+from collections import deque
+
+from engine import OPPOSITES
+
+
+class InputQueue:
+    """Bounded queue of timestamped turns, consumed at most one per tick.
+
+    A key press is checked against the last queued turn (or the direction
+    applied last when nothing is queued), so Up then Left inside one tick
+    both survive and a reversal is never queued. Each turn is checked again
+    when a tick takes it, against the direction the snake actually moved.
+    """
+
+    def __init__(self, size=3, clock=time.perf_counter, history=256):
+        self.size = size
+        self.clock = clock
+        self.pending = deque()
+        self.latencies = deque(maxlen=history)
+        self.dropped = 0
+
+    def push(self, direction, applied):
+        last = self.pending[-1][0] if self.pending else applied
+        if direction == last or direction == OPPOSITES[last]:
+            return False
+        if len(self.pending) >= self.size:
+            self.dropped += 1
+            return False
+        self.pending.append((direction, self.clock()))
+        return True
+
+    def pop(self, applied):
+        """Next valid turn relative to the applied direction, or None."""
+        while self.pending:
+            direction, pressed_at = self.pending.popleft()
+            if direction != applied and direction != OPPOSITES[applied]:
+                self.latencies.append(self.clock() - pressed_at)
+                return direction
+        return None
+
+    def clear(self):
+        self.pending.clear()
+
+    def stats(self):
+        """Input-to-movement latency of the recent turns, in ms."""
+        import statistics
+        latencies = sorted(latency * 1000 for latency in self.latencies)
+        return {
+            "turns": len(latencies),
+            "dropped": self.dropped,
+            "latency_mean_ms": statistics.fmean(latencies) if latencies else 0.0,
+            "latency_p50_ms": latencies[len(latencies) // 2] if latencies else 0.0,
+            "latency_max_ms": latencies[-1] if latencies else 0.0
+        }
@@ -0,0 +1,456 @@
+"""Drawing backends for SnakeGame, picked with --renderer.
+
+Every backend offers the same small interface, in screen coordinates with
+the origin in the middle and y pointing up (turtle's convention):
+
+    snake_renderer(color_func, camera)       a SegmentRenderer for the snake
+    draw_background(spacing, color)
+    show_food(pos, size) / color_food(color)   pos None hides the food
+    show_glow(pos, sizes, color)              pos None hides the glow
+    write(slot, text, pos, color, font, align="center") / clear_text(slot)
+    start_effect() / draw_effect(effect, pos, size, color) / end_effect(effect)
+    ontimer(callback, ms), onkey(callback, key), update(), mainloop(), quit()
+
+Keys use turtle's names ("Up", "space", "p", "1"). start_effect returns
+None when the backend has no effect to spare, and the effect is skipped.
+The two Tk backends also have item_count(), the number of live canvas
+items, for checking that long games do not leak them (bench.py --render).
+"""
+import heapq
+import itertools
+import time
+import tkinter
+import turtle
+
+from effects import StampGroup, TurtlePool, canvas_item_count
+from renderers import SnakeCellRenderer, SnakeRectRenderer, SnakeStampRenderer, draw_background_grid
+
+
+class TurtleDisplay:
+    """The original look: turtle stamps, turtle text and pooled effect turtles."""
+
+    def __init__(self, width, height, title, background):
+        self.width = width
+        self.height = height
+        self.screen = turtle.Screen()
+        self.screen.setup(width, height)
+        self.screen.title(title)
+        self.screen.bgcolor(background)
+        self.screen.tracer(0)
+        self.screen.listen()
+        self.bg_item = None
+        self.food = self.make_turtle("circle")
+        self.glow = None
+        self.texts = {}
+        self.effect_pool = TurtlePool()
+
+    def make_turtle(self, shape="classic"):
+        pen = turtle.Turtle()
+        pen.shape(shape)
+        pen.penup()
+        pen.hideturtle()
+        return pen
+
+    def snake_renderer(self, color_func, camera):
+        return SnakeStampRenderer(self.make_turtle("square"), color_func, camera)
+
+    def draw_background(self, spacing, color):
+        # Drawn once into a cached image; drawing again just re-places that image
+        self.bg_item = draw_background_grid(self.screen.getcanvas(), self.width, self.height,
+                                            spacing, color, self.bg_item)
+
+    def show_food(self, pos, size):
+        if pos is None:
+            self.food.hideturtle()
+            return
+        self.food.shapesize(size/20)
+        self.food.goto(pos)
+        self.food.showturtle()
+
+    def color_food(self, color):
+        self.food.color(color)
+
+    def show_glow(self, pos, sizes, color):
+        # Larger circles recolored in place until the food moves
+        if self.glow is None:
+            self.glow = StampGroup(self.make_turtle("circle"), [size/20 for size in sizes])
+        if pos is None:
+            self.glow.clear()
+        else:
+            self.glow.draw(pos, color)
+
+    def write(self, slot, text, pos, color, font, align="center"):
+        pen = self.texts.get(slot)
+        if pen is None:
+            pen = self.texts[slot] = self.make_turtle()
+        pen.clear()
+        pen.color(color)
+        pen.goto(pos)
+        pen.write(text, align=align, font=font)
+
+    def clear_text(self, slot):
+        if slot in self.texts:
+            self.texts[slot].clear()
+
+    def start_effect(self):
+        return self.effect_pool.acquire()
+
+    def draw_effect(self, effect, pos, size, color):
+        effect.clear()
+        effect.goto(pos)
+        effect.color(color)
+        effect.dot(size)
+
+    def end_effect(self, effect):
+        self.effect_pool.release(effect)
+
+    def ontimer(self, callback, ms):
+        turtle.ontimer(callback, ms)
+
+    def onkey(self, callback, key):
+        self.screen.onkey(callback, key)
+
+    def update(self):
+        self.screen.update()
+
+    def item_count(self):
+        return canvas_item_count(self.screen)
+
+    def mainloop(self):
+        turtle.done()
+
+    def quit(self):
+        self.screen.bye()
+
+
+class CanvasDisplay:
+    """Draws straight onto a tkinter.Canvas with long-lived items.
+
+    The snake is rectangles moved with coords(), food, glow and effects are
+    ovals, and every text slot is one text item. Nothing is created or
+    deleted per tick, so there is no turtle bookkeeping on top of Tk.
+    """
+
+    ANCHORS = {"center": "s", "left": "sw", "right": "se"}
+
+    def __init__(self, width, height, title, background, effect_budget=4):
+        self.width = width
+        self.height = height
+        self.root = tkinter.Tk()
+        self.root.title(title)
+        self.root.resizable(False, False)
+        self.canvas = tkinter.Canvas(self.root, width=width, height=height, background=background,
+                                     highlightthickness=0)
+        # Put the origin in the middle like turtle's canvas (y still grows downward)
+        self.canvas.configure(scrollregion=(-width/2, -height/2, width/2, height/2))
+        self.canvas.pack()
+        self.bg_item = None
+        self.food = self.canvas.create_oval(0, 0, 0, 0, fill="black", outline="black", state="hidden")
+        self.glow = []
+        self.texts = {}
+        self.effect_budget = effect_budget
+        self.effects = []
+
+    def snake_renderer(self, color_func, camera):
+        return SnakeRectRenderer(self.canvas, color_func, camera)
+
+    def draw_background(self, spacing, color):
+        self.bg_item = draw_background_grid(self.canvas, self.width, self.height, spacing, color, self.bg_item)
+
+    def place_oval(self, item, pos, size, **options):
+        x, y = pos
+        self.canvas.coords(item, x - size/2, -y - size/2, x + size/2, -y + size/2)
+        self.canvas.itemconfig(item, state="normal", **options)
+
+    def show_food(self, pos, size):
+        if pos is None:
+            self.canvas.itemconfig(self.food, state="hidden")
+        else:
+            self.place_oval(self.food, pos, size)
+
+    def color_food(self, color):
+        self.canvas.itemconfig(self.food, fill=color, outline=color)
+
+    def show_glow(self, pos, sizes, color):
+        if not self.glow:
+            self.glow = [self.canvas.create_oval(0, 0, 0, 0, state="hidden") for _ in sizes]
+            for item in self.glow:
+                self.canvas.tag_lower(item, self.food)
+        for item, size in zip(self.glow, sizes):
+            if pos is None:
+                self.canvas.itemconfig(item, state="hidden")
+            else:
+                self.place_oval(item, pos, size, fill=color, outline=color)
+
+    def write(self, slot, text, pos, color, font, align="center"):
+        item = self.texts.get(slot)
+        if item is None:
+            item = self.texts[slot] = self.canvas.create_text(0, 0)
+        self.canvas.coords(item, pos[0], -pos[1])
+        self.canvas.itemconfig(item, text=text, fill=color, font=font, anchor=self.ANCHORS[align],
+                               state="normal")
+
+    def clear_text(self, slot):
+        if slot in self.texts:
+            self.canvas.itemconfig(self.texts[slot], state="hidden")
+
+    def start_effect(self):
+        for effect in self.effects:
+            if effect[1]:
+                effect[1] = False
+                return effect
+        if len(self.effects) < self.effect_budget:
+            effect = [self.canvas.create_oval(0, 0, 0, 0, outline=""), False]
+            self.effects.append(effect)
+            return effect
+        return None
+
+    def draw_effect(self, effect, pos, size, color):
+        self.place_oval(effect[0], pos, size, fill=color)
+
+    def end_effect(self, effect):
+        self.canvas.itemconfig(effect[0], state="hidden")
+        effect[1] = True
+
+    def ontimer(self, callback, ms):
+        self.root.after(ms, callback)
+
+    def onkey(self, callback, key):
+        self.root.bind(f"<KeyPress-{key}>", lambda event: callback())
+
+    def update(self):
+        self.canvas.update_idletasks()
+
+    def item_count(self):
+        return len(self.canvas.find_all())
+
+    def mainloop(self):
+        self.root.mainloop()
+
+    def quit(self):
+        self.root.destroy()
+
+
+def terminal_color(color, colors):
+    """Closest terminal color number to a "#rrggbb" color."""
+    r, g, b = (int(color[i:i + 2], 16) for i in (1, 3, 5))
+    if colors >= 256:
+        # The 6x6x6 color cube of 256-color terminals
+        return 16 + 36 * round(r / 51) + 6 * round(g / 51) + round(b / 51)
+    # The 8 basic colors: black, red, green, yellow, blue, magenta, cyan, white
+    brightest = max(r, g, b, 1)
+    return sum(bit for bit, channel in ((1, r), (2, g), (4, b)) if channel * 2 > brightest)
+
+
+class TerminalDisplay:
+    """Draws in a terminal with curses, so the game also runs over SSH.
+
+    A board cell is two character columns wide. The view is sized to the
+    terminal and the camera follows the head as on a large board. Every
+    drawn character is remembered, so only cells whose text or color
+    changed are written, and curses sends only changed characters on
+    refresh. The top row holds the score and the bottom three rows the
+    credits and the two lines of instructions. Food effects and the glow are not drawn.
+    """
+
+    SEGMENT = "██"
+    FOOD = "()"
+    ROWS = {"score": 0, "credits": -3, "instructions": -2, "keys": -1}
+
+    def __init__(self, width, height, title, background, segment_size=20):
+        # curses is missing on some platforms, so it is only imported by this backend
+        import curses
+        self.curses = curses
+        self.stdscr = curses.initscr()
+        curses.noecho()
+        curses.cbreak()
+        self.stdscr.keypad(True)
+        try:
+            curses.curs_set(0)
+        except curses.error:
+            pass
+        self.has_colors = curses.has_colors()
+        self.default_background = -1
+        if self.has_colors:
+            curses.start_color()
+            try:
+                curses.use_default_colors()
+            except curses.error:
+                self.default_background = curses.COLOR_BLACK
+
+        self.lines, columns = self.stdscr.getmaxyx()
+        self.rows = self.lines - 4
+        self.columns = columns // 2
+        self.segment_size = segment_size
+        self.width = self.columns * segment_size
+        self.height = self.rows * segment_size
+        self.attrs = {}
+        self.pairs = {}
+        self.board = {}
+        self.texts = {}
+        self.spacing = None
+        self.background_attr = 0
+        self.food = None
+        self.food_color = "#e74c3c"
+        self.timers = []
+        self.counter = itertools.count()
+        self.keys = {}
+        self.running = False
+        self.key_codes = {"Up": curses.KEY_UP, "Down": curses.KEY_DOWN, "Left": curses.KEY_LEFT,
+                          "Right": curses.KEY_RIGHT, "space": ord(" ")}
+
+    def attr(self, color):
+        attr = self.attrs.get(color)
+        if attr is None:
+            attr = 0
+            if self.has_colors:
+                number = terminal_color(color, self.curses.COLORS)
+                attr = self.pairs.get(number)
+                if attr is None:
+                    attr = 0
+                    if len(self.pairs) + 1 < self.curses.COLOR_PAIRS:
+                        pair = len(self.pairs) + 1
+                        self.curses.init_pair(pair, number, self.default_background)
+                        attr = self.curses.color_pair(pair)
+                    self.pairs[number] = attr
+            self.attrs[color] = attr
+        return attr
+
+    def cell(self, pos):
+        """(row, column) of the board cell at a screen position, or None outside the view."""
+        row = 1 + self.rows // 2 - round(pos[1] / self.segment_size)
+        column = self.columns // 2 + round(pos[0] / self.segment_size)
+        if 1 <= row <= self.rows and 0 <= column < self.columns:
+            return row, column
+        return None
+
+    def background_text(self, row, column):
+        x = (column - self.columns // 2) * self.segment_size
+        y = (1 + self.rows // 2 - row) * self.segment_size
+        if self.spacing and x % self.spacing == 0 and y % self.spacing == 0:
+            return " ."
+        return "  "
+
+    def paint(self, row, column, text, attr):
+        if self.board.get((row, column)) == (text, attr):
+            return
+        self.board[(row, column)] = (text, attr)
+        try:
+            self.stdscr.addstr(row, column * 2, text, attr)
+        except self.curses.error:
+            # Writing the bottom-right corner moves the cursor off screen
+            pass
+
+    def put(self, pos, text, color):
+        cell = self.cell(pos)
+        if cell is not None:
+            self.paint(cell[0], cell[1], text, self.attr(color))
+
+    def erase(self, pos):
+        cell = self.cell(pos)
+        if cell is not None:
+            self.paint(cell[0], cell[1], self.background_text(*cell), self.background_attr)
+
+    def snake_renderer(self, color_func, camera):
+        return SnakeCellRenderer(self, color_func, camera)
+
+    def draw_background(self, spacing, color):
+        self.spacing = spacing
+        self.background_attr = self.attr(color)
+        for row in range(1, self.rows + 1):
+            for column in range(self.columns):
+                self.paint(row, column, self.background_text(row, column), self.background_attr)
+
+    def show_food(self, pos, size):
+        if self.food is not None:
+            self.erase(self.food)
+        self.food = pos
+        if pos is not None:
+            self.put(pos, self.FOOD, self.food_color)
+
+    def color_food(self, color):
+        self.food_color = color
+        if self.food is not None:
+            self.put(self.food, self.FOOD, color)
+
+    def show_glow(self, pos, sizes, color):
+        pass
+
+    def write(self, slot, text, pos, color, font, align="center"):
+        self.clear_text(slot)
+        width = self.columns * 2
+        row = self.ROWS.get(slot)
+        if row is None:
+            row = 1 + self.rows // 2 - round(pos[1] / self.segment_size)
+        row = max(0, min(self.lines - 1, row % self.lines))
+        text = text[:width - 1]
+        column = {"center": (width - len(text)) // 2, "left": 0, "right": width - 1 - len(text)}[align]
+        self.texts[slot] = (row, column, len(text))
+        try:
+            self.stdscr.addstr(row, column, text, self.attr(color) | self.curses.A_BOLD)
+        except self.curses.error:
+            pass
+
+    def clear_text(self, slot):
+        placed = self.texts.pop(slot, None)
+        if placed is None:
+            return
+        row, column, length = placed
+        # Put back whatever board cells the text covered
+        for board_column in range(column // 2, (column + length + 1) // 2):
+            drawn = self.board.pop((row, board_column), None)
+            if drawn is not None:
+                self.paint(row, board_column, *drawn)
+            else:
+                try:
+                    self.stdscr.addstr(row, board_column * 2, "  ")
+                except self.curses.error:
+                    pass
+
+    def start_effect(self):
+        return None
+
+    def ontimer(self, callback, ms):
+        heapq.heappush(self.timers, (time.monotonic() + ms / 1000, next(self.counter), callback))
+
+    def onkey(self, callback, key):
+        self.keys[self.key_codes.get(key) or ord(key)] = callback
+
+    def update(self):
+        self.stdscr.refresh()
+
+    def mainloop(self):
+        """Run timers and keys until q, Escape, Ctrl-C or quit(), then restore the terminal."""
+        self.running = True
+        try:
+            while self.running:
+                now = time.monotonic()
+                while self.timers and self.timers[0][0] <= now:
+                    heapq.heappop(self.timers)[2]()
+                    now = time.monotonic()
+                if not self.running:
+                    break
+                self.stdscr.timeout(int((self.timers[0][0] - now) * 1000) + 1 if self.timers else -1)
+                key = self.stdscr.getch()
+                if key in (ord("q"), 27):
+                    break
+                callback = self.keys.get(key)
+                if callback is not None:
+                    callback()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stdscr.keypad(False)
+            self.curses.nocbreak()
+            self.curses.echo()
+            self.curses.endwin()
+
+    def quit(self):
+        self.running = False
+
+
+DISPLAYS = {
+    "turtle": TurtleDisplay,
+    "canvas": CanvasDisplay,
+    "terminal": TerminalDisplay
+}
@@ -0,0 +1,76 @@
+import turtle
+
+
+def canvas_item_count(screen):
+    """Number of items currently alive on the screen's canvas."""
+    return len(screen.getcanvas().find_all())
+
+
+def make_effect_turtle():
+    effect = turtle.Turtle()
+    effect.penup()
+    effect.hideturtle()
+    return effect
+
+
+class TurtlePool:
+    """Hands out hidden turtles for short-lived effects and reuses them.
+
+    At most budget turtles are ever created; acquire returns None once they
+    are all busy, so callers skip the effect rather than growing the canvas.
+    """
+
+    def __init__(self, budget=4, factory=make_effect_turtle):
+        self.budget = budget
+        self.factory = factory
+        self.free = []
+        self.created = 0
+
+    def acquire(self):
+        if self.free:
+            return self.free.pop()
+        if self.created < self.budget:
+            self.created += 1
+            return self.factory()
+        return None
+
+    def release(self, effect):
+        effect.clear()
+        self.free.append(effect)
+
+    @property
+    def in_use(self):
+        return self.created - len(self.free)
+
+
+class StampGroup:
+    """A fixed set of stamps that is recolored in place and only re-stamped when it moves."""
+
+    def __init__(self, pen, sizes):
+        self.pen = pen
+        self.canvas = pen.screen.getcanvas()
+        self.sizes = sizes
+        self.stamp_ids = []
+        self.pos = None
+        self.color = None
+
+    def draw(self, pos, color):
+        if pos != self.pos:
+            self.pen.clearstamps()
+            self.pen.goto(pos)
+            self.pen.color(color)
+            self.stamp_ids = []
+            for size in self.sizes:
+                self.pen.shapesize(size)
+                self.stamp_ids.append(self.pen.stamp())
+            self.pos = pos
+        elif color != self.color:
+            for stamp_id in self.stamp_ids:
+                self.canvas.itemconfig(stamp_id, fill=color, outline=color)
+        self.color = color
+
+    def clear(self):
+        self.pen.clearstamps()
+        self.stamp_ids = []
+        self.pos = None
+        self.color = None
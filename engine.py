@@ -0,0 +1,318 @@
+import random
+from collections import deque, namedtuple
+
+# Constants
+WIDTH = 800
+HEIGHT = 600
+SEGMENT_SIZE = 20
+
+DIRECTIONS = {
+    "up": (0, 1),
+    "down": (0, -1),
+    "left": (-1, 0),
+    "right": (1, 0)
+}
+VECTORS = {vector: direction for direction, vector in DIRECTIONS.items()}
+OPPOSITES = {"up": "down", "down": "up", "left": "right", "right": "left"}
+
+# Tick interval in ms for each speed setting
+SPEED_LEVELS = {
+    "Slow": 180,
+    "Normal": 130,
+    "Fast": 80,
+    "Ultra": 50
+}
+
+StepResult = namedtuple("StepResult", ["snake", "food", "score", "done", "ate", "won"])
+
+
+class FreeCells:
+    """Set of free grid cells supporting O(1) add, discard and uniform choice."""
+
+    def __init__(self, cells=()):
+        self.cells = list(cells)
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return cell in self.index
+
+    def add(self, cell):
+        if cell not in self.index:
+            self.index[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def discard(self, cell):
+        i = self.index.pop(cell, None)
+        if i is None:
+            return
+        # Swap the last cell into the hole so the list stays dense
+        last = self.cells.pop()
+        if i < len(self.cells):
+            self.cells[i] = last
+            self.index[last] = i
+
+    def choice(self, rng):
+        return self.cells[rng.randrange(len(self.cells))]
+
+
+def food_ranges(width, height, segment_size):
+    """Grid columns and rows food can land on: every cell strictly inside the board edges."""
+    low_x = -width//2 + segment_size
+    high_x = width//2 - segment_size
+    low_y = -height//2 + segment_size
+    high_y = height//2 - segment_size
+    return (range(low_x - low_x % segment_size, high_x - high_x % segment_size + 1, segment_size),
+            range(low_y - low_y % segment_size, high_y - high_y % segment_size + 1, segment_size))
+
+
+class SnakeEngine:
+    """Renderer-free snake rules, stepped one tick at a time."""
+
+    def __init__(self, width=WIDTH, height=HEIGHT, segment_size=SEGMENT_SIZE, seed=None):
+        self.width = width
+        self.height = height
+        self.segment_size = segment_size
+        self.rng = random.Random(seed)
+
+        self.food_xs, self.food_ys = food_ranges(width, height, segment_size)
+        self.next_seq = 0
+        self.reset()
+
+    def reset(self, seed=None):
+        # Every game gets its own seed so it can be replayed from it
+        if seed is None:
+            seed = self.rng.getrandbits(63)
+        self.seed = seed
+        self.rng.seed(seed)
+        self.tick = 0
+        size = self.segment_size
+        self.set_snake([(0, 0), (0, size), (0, size * 2)], "up")
+        self.score = 0
+        return self.state()
+
+    def set_snake(self, cells, direction=None, food_pos=None):
+        """Replace the body (tail first) and rebuild the occupancy indexes."""
+        self.snake = deque(cells)
+        # Cell -> sequence number of the move that put a segment there, so a
+        # segment's index in the body is its number minus the tail's
+        self.occupied = {}
+        for cell in self.snake:
+            self.occupied[cell] = self.next_seq
+            self.next_seq += 1
+        self.food_cells = len(self.food_xs) * len(self.food_ys)
+        self.covered = sum(1 for cell in self.snake if self.in_food_area(cell))
+        self.free = None
+        if direction is not None:
+            self.direction = direction
+        self.done = False
+        self.won = False
+        self.death_cause = None
+        self.freed = None
+        self.food_pos = food_pos if food_pos is not None else self.random_food_pos()
+
+    def state(self, ate=False):
+        """The game as of now. snake is the engine's own deque, not a copy: it is
+        only valid until the next step, so take tuple(result.snake) to keep it."""
+        return StepResult(self.snake, self.food_pos, self.score, self.done, ate, self.won)
+
+    def step(self, direction=None):
+        if self.done:
+            return self.state()
+        if direction is not None:
+            self.direction = direction
+        self.tick += 1
+
+        # Calculate new head position
+        dx, dy = DIRECTIONS[self.direction]
+        head = self.snake[-1]
+        new_head = (head[0] + dx * self.segment_size, head[1] + dy * self.segment_size)
+
+        # Check collisions (the tail still counts, it only moves after the check)
+        if (new_head[0] < -self.width/2 or new_head[0] > self.width/2 or
+            new_head[1] < -self.height/2 or new_head[1] > self.height/2):
+            self.death_cause = "wall"
+        elif new_head in self.occupied:
+            self.death_cause = "self"
+        if self.death_cause:
+            self.done = True
+            return self.state()
+
+        self.snake.append(new_head)
+        self.occupied[new_head] = self.next_seq
+        self.next_seq += 1
+        if self.in_food_area(new_head):
+            self.covered += 1
+            if self.free is not None:
+                self.free.discard(new_head)
+
+        # Check food collision (positions are grid aligned, so this is the old distance test)
+        if new_head == self.food_pos:
+            self.freed = None
+            self.score += 10
+            self.food_pos = self.random_food_pos()
+            if self.food_pos is None:
+                self.won = True
+                self.done = True
+                self.death_cause = "win"
+            return self.state(ate=True)
+
+        tail = self.freed = self.snake.popleft()
+        del self.occupied[tail]
+        if self.in_food_area(tail):
+            self.covered -= 1
+            if self.free is not None:
+                self.free.add(tail)
+        return self.state()
+
+    def unstep(self, head, freed, food_pos, score, direction):
+        """Undo the last move: take head off and put back the tail cell it freed (None if it ate).
+
+        food_pos, score and direction are the values from before that move.
+        """
+        if not self.snake or self.snake[-1] != head:
+            raise ValueError(f"last move did not put the head on {head}")
+        self.snake.pop()
+        # Moves are undone newest first, so the head holds the newest sequence number
+        self.next_seq = self.occupied.pop(head)
+        if self.in_food_area(head):
+            self.covered -= 1
+            if self.free is not None:
+                self.free.add(head)
+        if freed is not None:
+            self.occupied[freed] = self.occupied[self.snake[0]] - 1
+            self.snake.appendleft(freed)
+            if self.in_food_area(freed):
+                self.covered += 1
+                if self.free is not None:
+                    self.free.discard(freed)
+        self.tick -= 1
+        self.food_pos = food_pos
+        self.score = score
+        self.direction = direction
+        self.done = False
+        self.won = False
+        self.death_cause = None
+        self.freed = None
+
+    def revive(self, direction):
+        """Undo a move that crashed, which only counted a tick and turned the head to direction."""
+        self.tick -= 1
+        self.direction = direction
+        self.done = False
+        self.death_cause = None
+
+    def in_food_area(self, cell):
+        return cell[0] in self.food_xs and cell[1] in self.food_ys
+
+    def segment_index(self, cell):
+        """Position of the segment on cell counted from the tail, or None if it is free."""
+        seq = self.occupied.get(cell)
+        if seq is None:
+            return None
+        return seq - self.occupied[self.snake[0]]
+
+    def random_food_pos(self):
+        # None means the snake covers every cell food could go on
+        if self.covered >= self.food_cells:
+            return None
+        # While most of the board is free, drawing random cells until one is
+        # free takes fewer than two tries on average and needs no per-cell
+        # memory, which matters on boards of millions of cells. Past half full
+        # switch to an explicit free list, which is then no bigger than the snake.
+        if self.free is None and self.covered * 2 <= self.food_cells:
+            xs, ys, rng = self.food_xs, self.food_ys, self.rng
+            while True:
+                cell = (xs[rng.randrange(len(xs))], ys[rng.randrange(len(ys))])
+                if cell not in self.occupied:
+                    return cell
+        if self.free is None:
+            self.free = FreeCells((x, y) for x in self.food_xs for y in self.food_ys
+                                  if (x, y) not in self.occupied)
+        return self.free.choice(self.rng)
+
+
+def direction_between(cell, next_cell, segment_size=SEGMENT_SIZE):
+    """Direction of a one-cell move from cell to next_cell (None if they are not neighbours)."""
+    dx = next_cell[0] - cell[0]
+    dy = next_cell[1] - cell[1]
+    if abs(dx) + abs(dy) != segment_size:
+        return None
+    return VECTORS.get((dx // segment_size, dy // segment_size))
+
+
+class HamiltonianCycle:
+    """The cycle of hamiltonian_cycle, with positions computed instead of stored.
+
+    index(cell) and cell(index) are a few arithmetic operations each, so a
+    board of millions of cells costs no memory and no time to set up.
+    """
+
+    def __init__(self, width=WIDTH, height=HEIGHT, segment_size=SEGMENT_SIZE):
+        self.segment_size = segment_size
+        self.left = -(width//2 // segment_size) * segment_size
+        self.bottom = -(height//2 // segment_size) * segment_size
+        self.columns = (width//2 - self.left) // segment_size + 1
+        self.rows = (height//2 - self.bottom) // segment_size + 1
+        if self.columns % 2:
+            self.columns -= 1
+        # Where the lane back along the bottom row starts
+        self.lane = 1 + self.columns * (self.rows - 1)
+
+    def __len__(self):
+        return self.columns * self.rows
+
+    def index(self, cell):
+        """Position of cell on the cycle, or None if the cycle does not go through it."""
+        size = self.segment_size
+        column, x_offset = divmod(cell[0] - self.left, size)
+        row, y_offset = divmod(cell[1] - self.bottom, size)
+        if x_offset or y_offset or not (0 <= column < self.columns and 0 <= row < self.rows):
+            return None
+        if row == 0:
+            if column == 0:
+                return 0
+            if column == self.columns - 1:
+                return self.lane
+            return self.lane + self.columns - 1 - column
+        if column % 2 == 0:
+            return 1 + column * (self.rows - 1) + row - 1
+        return 1 + column * (self.rows - 1) + self.rows - 1 - row
+
+    def cell(self, index):
+        """The cell at a position of the cycle (taken modulo its length)."""
+        index %= len(self)
+        size = self.segment_size
+        if index == 0:
+            column, row = 0, 0
+        elif index >= self.lane:
+            column, row = self.columns - 1 - (index - self.lane), 0
+        else:
+            column, step = divmod(index - 1, self.rows - 1)
+            row = step + 1 if column % 2 == 0 else self.rows - 1 - step
+        return (self.left + column * size, self.bottom + row * size)
+
+
+def hamiltonian_cycle(width=WIDTH, height=HEIGHT, segment_size=SEGMENT_SIZE):
+    """A closed path through the in-bounds grid cells, as a list of cells.
+
+    Columns go up and down in a serpentine over every row but the bottom one,
+    which is the lane back to the start. A cycle needs an even number of
+    columns, so with an odd count the rightmost column is left out.
+    """
+    xs = list(range(-(width//2 // segment_size) * segment_size, width//2 + 1, segment_size))
+    ys = list(range(-(height//2 // segment_size) * segment_size, height//2 + 1, segment_size))
+    if len(xs) % 2:
+        xs.pop()
+
+    cycle = []
+    for i, x in enumerate(xs):
+        column = ys[1:] if i % 2 == 0 else ys[:0:-1]
+        if i == 0:
+            cycle.append((x, ys[0]))
+        cycle.extend((x, y) for y in column)
+    cycle.append((xs[-1], ys[0]))
+    cycle.extend((x, ys[0]) for x in reversed(xs[1:-1]))
+    return cycle
@@ -0,0 +1,215 @@
+"""Persistent leaderboard: an append-only file of fixed-size score records.
+
+    header  magic "SNKH", version
+    record  score (u32), length (u32), speed (u8), timestamp (f64), name (24 bytes, UTF-8)
+
+Every finished game is appended; the top entries are kept in memory as a
+sorted index. The file is only read on first use, in one pass on the
+writer thread. A record cut short by a crash mid-write is dropped, and the
+file is trimmed back to its last whole record before anything new is
+appended, so later records stay aligned.
+
+    python highscores.py ~/.neon-snake-scores --top 20
+"""
+import argparse
+import bisect
+import heapq
+import os
+import queue
+import struct
+import threading
+import time
+from collections import namedtuple
+
+from engine import SPEED_LEVELS
+
+MAGIC = b"SNKH"
+VERSION = 1
+HEADER = struct.Struct("<4sB")
+RECORD = struct.Struct("<IIBd24s")
+
+SPEED_NAMES = list(SPEED_LEVELS)
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".neon-snake-scores")
+
+HighScore = namedtuple("HighScore", ["name", "score", "length", "speed", "timestamp"])
+
+
+class HighScoreError(Exception):
+    pass
+
+
+def rank_key(entry):
+    # Higher scores first, the earlier of two equal scores first
+    return (-entry.score, entry.timestamp)
+
+
+def pack(entry):
+    return RECORD.pack(entry.score, entry.length, SPEED_NAMES.index(entry.speed), entry.timestamp,
+                       entry.name.encode()[:24])
+
+
+def unpack(record):
+    score, length, speed, timestamp, name = record
+    return HighScore(name.rstrip(b"\0").decode(errors="ignore"), score, length, SPEED_NAMES[speed], timestamp)
+
+
+class HighScoreStore:
+    """Top-size leaderboard backed by an append-only file written from a background thread.
+
+    add() only updates the in-memory index and queues the record, so a
+    caller on the Tk event loop never waits on the disk. The writer thread
+    loads the file first, then appends queued records in batches, one
+    write and fsync per batch.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, size=10, batch_delay=0.5):
+        self.path = path
+        self.size = size
+        self.batch_delay = batch_delay  # Seconds to wait for more records before writing a batch
+        self.entries = []
+        self.keys = []
+        self.lock = threading.Lock()
+        self.queue = queue.Queue()
+        self.loaded = threading.Event()
+        self.thread = None
+        self.error = None
+        self.records = 0
+
+    def start(self):
+        """Start loading in the background; called on first use if not before."""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="highscores", daemon=True)
+            self.thread.start()
+
+    def insert(self, entry):
+        # Caller holds the lock; returns the 1-based rank, or None if it missed the board
+        key = rank_key(entry)
+        i = bisect.bisect_right(self.keys, key)
+        if i >= self.size:
+            return None
+        self.keys.insert(i, key)
+        self.entries.insert(i, entry)
+        del self.keys[self.size:], self.entries[self.size:]
+        return i + 1
+
+    def rank(self, entry):
+        """The 1-based rank entry would get if it were added now, or None."""
+        self.start()
+        with self.lock:
+            i = bisect.bisect_right(self.keys, rank_key(entry))
+        return i + 1 if i < self.size else None
+
+    def add(self, entry):
+        self.start()
+        with self.lock:
+            rank = self.insert(entry)
+        self.queue.put(entry)
+        return rank
+
+    def top(self, wait=True):
+        """The leaderboard, best first. With wait=False it may miss entries still being loaded."""
+        self.start()
+        if wait:
+            self.loaded.wait()
+        with self.lock:
+            return list(self.entries)
+
+    def best(self):
+        entries = self.top(wait=False)
+        return entries[0].score if entries else 0
+
+    def flush(self):
+        """Block until every added entry is on disk."""
+        self.start()
+        self.queue.join()
+
+    def close(self):
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def load(self):
+        """Read the file into the index and return it opened for appending whole records."""
+        # Append mode, so games finished in two windows at once never overwrite each other
+        f = open(self.path, "a+b")
+        f.seek(0)
+        size = os.fstat(f.fileno()).st_size
+        if size < HEADER.size:
+            # New file, or one that never got its whole header
+            f.truncate(0)
+            f.write(HEADER.pack(MAGIC, VERSION))
+            f.flush()
+            return f
+        magic, version = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            f.close()
+            raise HighScoreError(f"{self.path}: not a version {VERSION} score file")
+
+        self.records = (size - HEADER.size) // RECORD.size
+        data = f.read(self.records * RECORD.size)
+        best = heapq.nsmallest(self.size, map(unpack, RECORD.iter_unpack(data)), key=rank_key)
+        # Drop a partly written last record so new records stay aligned
+        end = HEADER.size + self.records * RECORD.size
+        if size != end:
+            f.truncate(end)
+        with self.lock:
+            # Entries added while the file was loading are not in it yet, so none is counted twice
+            for entry in best:
+                self.insert(entry)
+        return f
+
+    def run(self):
+        try:
+            f = self.load()
+        except (OSError, HighScoreError) as exc:
+            # Keep playing with an in-memory leaderboard rather than risk the file
+            self.error = exc
+            f = None
+        self.loaded.set()
+
+        while True:
+            batch = [self.queue.get()]
+            if batch[0] is not None:
+                time.sleep(self.batch_delay)
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            entries = [entry for entry in batch if entry is not None]
+            if f is not None and entries:
+                try:
+                    f.write(b"".join(pack(entry) for entry in entries))
+                    f.flush()
+                    os.fsync(f.fileno())
+                    self.records += len(entries)
+                except OSError as exc:
+                    self.error = exc
+            for _ in batch:
+                self.queue.task_done()
+            if len(entries) < len(batch):
+                if f is not None:
+                    f.close()
+                return
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", nargs="?", default=DEFAULT_PATH)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    store = HighScoreStore(args.path, args.top)
+    entries = store.top()
+    store.close()
+    if store.error:
+        parser.exit(1, f"{store.error}\n")
+    print(f"{store.records} games recorded")
+    for rank, entry in enumerate(entries, 1):
+        played = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.timestamp))
+        print(f"{rank:>3}. {entry.name:<24} {entry.score:>7}  length {entry.length:<5} {entry.speed:<7} {played}")
+
+
+if __name__ == "__main__":
+    main()
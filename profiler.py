@@ -0,0 +1,192 @@
+import os
+import time
+from array import array
+
+
+class FrameProfiler:
+    """Opt-in per-phase frame timings kept in fixed-size ring buffers.
+
+    Phases are methods registered with instrument(). They are only wrapped
+    with timing code while the profiler is enabled and put back untouched on
+    disable, so a disabled profiler costs nothing per frame. Timings are
+    exclusive: a phase called from inside another (update_food_color inside
+    move_snake) is not counted twice. The "frame" phase is the exception and
+    times the whole frame, its inner phases included. Sources added with add_stats() are
+    read only when a snapshot is taken, and go into the metrics as they are.
+    """
+
+    def __init__(self, size=512, clock=time.perf_counter):
+        self.size = size
+        self.clock = clock
+        self.enabled = False
+        self.hooks = []
+        self.saved = []
+        self.buffers = {}
+        self.counts = {}
+        self.frame_times = array("d", [0.0] * size)
+        self.frames = 0
+        self.child_time = 0.0
+        self.stats_sources = {}
+
+    def add_stats(self, name, stats):
+        """Include stats(), a dict of numbers, in every snapshot under name."""
+        self.stats_sources[name] = stats
+
+    def instrument(self, target, name, phase):
+        self.hooks.append((target, name, phase))
+        self.buffers.setdefault(phase, array("d", [0.0] * self.size))
+        self.counts.setdefault(phase, 0)
+        if self.enabled:
+            self.wrap(target, name, phase)
+
+    def enable(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        for target, name, phase in self.hooks:
+            self.wrap(target, name, phase)
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        for target, name, original, own in reversed(self.saved):
+            if own:
+                setattr(target, name, original)
+            else:
+                delattr(target, name)
+        self.saved = []
+
+    def wrap(self, target, name, phase):
+        original = getattr(target, name)
+        self.saved.append((target, name, original, name in vars(target)))
+        clock = self.clock
+        record = self.record
+
+        def timed(*args, **kwargs):
+            outer_child_time = self.child_time
+            self.child_time = 0.0
+            start = clock()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                # A frame is timed whole; other phases leave out their inner phases
+                record(phase, elapsed if phase == "frame" else elapsed - self.child_time)
+                self.child_time = outer_child_time + elapsed
+                if phase == "frame":
+                    self.mark_frame(start)
+
+        setattr(target, name, timed)
+
+    def record(self, phase, elapsed):
+        count = self.counts[phase]
+        self.buffers[phase][count % self.size] = elapsed
+        self.counts[phase] = count + 1
+
+    def mark_frame(self, timestamp):
+        self.frame_times[self.frames % self.size] = timestamp
+        self.frames += 1
+
+    def samples(self, phase):
+        return sorted(self.buffers[phase][:min(self.counts[phase], self.size)])
+
+    def fps(self):
+        count = min(self.frames, self.size)
+        if count < 2:
+            return 0.0
+        newest = self.frame_times[(self.frames - 1) % self.size]
+        oldest = self.frame_times[(self.frames - count) % self.size]
+        return (count - 1) / (newest - oldest) if newest > oldest else 0.0
+
+    def snapshot(self):
+        phases = {}
+        for phase in self.buffers:
+            samples = self.samples(phase)
+            if not samples:
+                continue
+            phases[phase] = {
+                "count": self.counts[phase],
+                "mean_ms": sum(samples) / len(samples) * 1000,
+                "p50_ms": samples[int(len(samples) * 0.50)] * 1000,
+                "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000,
+                "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000
+            }
+        stats = {name: source() for name, source in self.stats_sources.items()}
+        return {"fps": self.fps(), "frames": self.frames, "phases": phases, "stats": stats}
+
+    def overlay_text(self):
+        snapshot = self.snapshot()
+        parts = [f"FPS {snapshot['fps']:.1f}"]
+        parts.extend(f"{phase} {stats['p50_ms']:.2f}/{stats['p99_ms']:.2f}ms"
+                     for phase, stats in snapshot["phases"].items())
+        return "  |  ".join(parts)
+
+    def prometheus_text(self):
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP snake_fps Frames rendered per second.",
+            "# TYPE snake_fps gauge",
+            f"snake_fps {snapshot['fps']:.3f}",
+            "# HELP snake_phase_seconds Exclusive time spent in each frame phase.",
+            "# TYPE snake_phase_seconds summary"
+        ]
+        for phase, stats in snapshot["phases"].items():
+            for quantile, key in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+                lines.append(f'snake_phase_seconds{{phase="{phase}",quantile="{quantile}"}} {stats[key] / 1000:.9f}')
+            lines.append(f'snake_phase_seconds_count{{phase="{phase}"}} {stats["count"]}')
+        for name, stats in snapshot["stats"].items():
+            lines.append(f"# HELP snake_{name} Counters and timings of the {name} source, as reported.")
+            lines.append(f"# TYPE snake_{name} gauge")
+            lines.extend(f'snake_{name}{{stat="{key}"}} {value}' for key, value in stats.items())
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        """Write the metrics as Prometheus text (for a .prom path) or JSON, replacing the file atomically."""
+        if path.endswith(".prom"):
+            content = self.prometheus_text()
+        else:
+            # Imported here so the game does not pay for json at startup
+            import json
+            content = json.dumps(self.snapshot(), indent=2)
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+
+
+class StartupTimer:
+    """Marks from the first line of the game script to the first frame on screen.
+
+    Each mark closes a phase that started at the previous one, so the report
+    shows where launch time goes: imports, the window, the background, ...
+    Time spent before Python runs the script (a frozen executable unpacking
+    itself, the interpreter starting) is not seen here; measure it from
+    outside, as startup_check.py does.
+    """
+
+    def __init__(self, started=None, clock=time.perf_counter):
+        self.clock = clock
+        self.started = clock() if started is None else started
+        self.marks = []
+
+    def mark(self, phase):
+        self.marks.append((phase, self.clock()))
+
+    def report(self):
+        phases = {}
+        previous = self.started
+        for phase, at in self.marks:
+            phases[phase] = round((at - previous) * 1000, 3)
+            previous = at
+        return {"phases_ms": phases, "total_ms": round((previous - self.started) * 1000, 3)}
+
+    def dump(self, path):
+        """Write the report as JSON to path, or to stdout for "-"."""
+        import json
+        content = json.dumps(self.report(), indent=2) + "\n"
+        if path == "-":
+            print(content, end="", flush=True)
+        else:
+            with open(path, "w") as f:
+                f.write(content)
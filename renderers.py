@@ -0,0 +1,312 @@
+import tkinter
+
+GLOW_SIZES = [1.1, 1.0]
+
+# Rendered background grids, shared by every canvas of the same Tk interpreter
+_grid_images = {}
+
+
+class Camera:
+    """Viewport of view_width x view_height pixels onto a board that can be much bigger.
+
+    The camera stays put until the head comes within a quarter of the view
+    from its edge, then recenters on the head. The center is snapped to snap
+    pixels so the background grid stays aligned, and clamped so the view never
+    leaves the board; on a board no bigger than the window it never moves.
+    """
+
+    def __init__(self, view_width, view_height, board_width, board_height, segment_size, snap=40):
+        self.half_width = view_width / 2
+        self.half_height = view_height / 2
+        self.segment_size = segment_size
+        self.snap = snap
+        # Rounded up so the cells along the walls always stay in view
+        self.max_x = -(-max(0, (board_width - view_width) // 2) // snap) * snap
+        self.max_y = -(-max(0, (board_height - view_height) // 2) // snap) * snap
+        self.x = 0
+        self.y = 0
+        self.moves = 0
+
+    def reset(self):
+        if self.x or self.y:
+            self.x = 0
+            self.y = 0
+            self.moves += 1
+
+    def follow(self, cell):
+        """Recenter on cell if it got near the edge of the view; returns whether the camera moved."""
+        if (abs(cell[0] - self.x) <= self.half_width / 2 and
+                abs(cell[1] - self.y) <= self.half_height / 2):
+            return False
+        x = max(-self.max_x, min(self.max_x, round(cell[0] / self.snap) * self.snap))
+        y = max(-self.max_y, min(self.max_y, round(cell[1] / self.snap) * self.snap))
+        if (x, y) == (self.x, self.y):
+            return False
+        self.x = x
+        self.y = y
+        self.moves += 1
+        return True
+
+    def visible(self, cell):
+        # Cells half inside the view still count
+        reach = self.segment_size / 2
+        return (abs(cell[0] - self.x) <= self.half_width + reach and
+                abs(cell[1] - self.y) <= self.half_height + reach)
+
+    def to_screen(self, cell):
+        return (cell[0] - self.x, cell[1] - self.y)
+
+    def cells(self):
+        """Every grid cell inside the view."""
+        size = self.segment_size
+        reach = size / 2
+        xs = range(-int((self.half_width + reach - self.x) // size) * size,
+                   int(self.x + self.half_width + reach) + 1, size)
+        ys = range(-int((self.half_height + reach - self.y) // size) * size,
+                   int(self.y + self.half_height + reach) + 1, size)
+        return ((x, y) for x in xs for y in ys)
+
+    def cell_count(self):
+        size = self.segment_size
+        return int((2 * self.half_width + size) // size + 1) * int((2 * self.half_height + size) // size + 1)
+
+
+class SegmentRenderer:
+    """Draws the snake one item per segment, touching only what changed since the last frame.
+
+    Only segments inside the camera view are drawn, so a frame costs time
+    in proportion to the visible part of the snake, not its length. Segments
+    are keyed by the engine's sequence numbers (see SnakeEngine.occupied), so
+    a segment's gradient index is its number minus the tail's. Backends
+    implement create, recolor, remove and remove_all for their own items.
+
+    Between ticks (alpha < 1) the newest move is drawn part way: the body
+    without its head, plus two end items, the head sliding in from the cell
+    behind it and the freed tail cell sliding out. Only the two ends change
+    per frame, and at alpha 1 the picture is the plain body again. Backends
+    that cannot draw between cells set smooth to False.
+    """
+
+    smooth = True
+
+    def __init__(self, color_func, camera):
+        self.color_func = color_func
+        self.camera = camera
+        # seq -> [cell, item, color] for every drawn segment
+        self.segments = {}
+        self.tail_seq = None
+        self.head_seq = None
+        self.camera_moves = None
+        self.total = None
+        self.ends = []
+
+    def draw(self, snake, occupied, alpha=1.0, freed=None):
+        """Draw the body; with alpha < 1, the move onto its head that far along (freed: the tail cell it let go)."""
+        segments = self.segments
+        camera = self.camera
+        total = len(snake)
+        moving = alpha < 1 and self.smooth and total > 1
+        tail_seq = occupied[snake[0]]
+        head_seq = occupied[snake[-2 if moving else -1]]
+
+        if self.head_seq is not None and head_seq == self.head_seq - 1 and camera.moves == self.camera_moves:
+            # Same body, the head is being slid in again: just take its segment off
+            segment = segments.pop(self.head_seq, None)
+            if segment is not None:
+                self.remove(segment[1])
+            self.head_seq = head_seq
+        if (self.head_seq is None or camera.moves != self.camera_moves or
+                tail_seq < self.tail_seq or head_seq < self.head_seq or tail_seq > self.head_seq):
+            # The view moved or the body was replaced (nothing left of the drawn one): redraw from scratch
+            self.redraw(snake, occupied, tail_seq, head_seq)
+        else:
+            # Erase the retracted tail
+            if tail_seq - self.tail_seq > len(segments):
+                for seq in [seq for seq in segments if seq < tail_seq]:
+                    self.remove(segments.pop(seq)[1])
+            else:
+                for seq in range(self.tail_seq, tail_seq):
+                    segment = segments.pop(seq, None)
+                    if segment is not None:
+                        self.remove(segment[1])
+
+            # Draw the new head
+            for seq in range(max(self.head_seq + 1, tail_seq), head_seq + 1):
+                cell = snake[seq - tail_seq]
+                if camera.visible(cell):
+                    color = self.color_func(seq - tail_seq, total)
+                    segments[seq] = [cell, self.create(cell, color), color]
+
+        # Colors only depend on the tail and the length; frames between ticks change neither
+        recolor = tail_seq != self.tail_seq or total != self.total
+        self.tail_seq = tail_seq
+        self.head_seq = head_seq
+        self.camera_moves = camera.moves
+        self.total = total
+
+        # Recolor the segments whose gradient color moved
+        if recolor:
+            for seq, segment in segments.items():
+                color = self.color_func(seq - tail_seq, total)
+                if segment[2] != color:
+                    self.recolor(segment[1], color)
+                    segment[2] = color
+
+        self.clear_ends()
+        if moving:
+            self.draw_end(snake[-2], snake[-1], alpha, self.color_func(total - 1, total))
+            if freed is not None:
+                self.draw_end(freed, snake[0], alpha, self.color_func(0, total))
+
+    def draw_end(self, start, end, alpha, color):
+        cell = (start[0] + (end[0] - start[0]) * alpha, start[1] + (end[1] - start[1]) * alpha)
+        if self.camera.visible(cell):
+            self.ends.append(self.create(cell, color))
+
+    def clear_ends(self):
+        for item in self.ends:
+            self.remove(item)
+        self.ends.clear()
+
+    def redraw(self, snake, occupied, tail_seq, head_seq):
+        self.clear()
+        camera = self.camera
+        total = len(snake)
+        # Walk whichever is smaller, the body or the cells in view
+        if total <= camera.cell_count():
+            cells = [cell for cell in snake if camera.visible(cell)]
+        else:
+            cells = [cell for cell in camera.cells() if cell in occupied]
+        for cell in cells:
+            if occupied[cell] > head_seq:
+                continue
+            seq = occupied[cell]
+            color = self.color_func(seq - tail_seq, total)
+            self.segments[seq] = [cell, self.create(cell, color), color]
+
+    def clear(self):
+        """Remove everything drawn; the next draw starts from scratch."""
+        self.clear_ends()
+        self.remove_all()
+        self.segments.clear()
+        self.tail_seq = None
+        self.head_seq = None
+
+
+class SnakeStampRenderer(SegmentRenderer):
+    """Turtle backend: each segment is a stack of glow stamps."""
+
+    def __init__(self, pen, color_func, camera):
+        super().__init__(color_func, camera)
+        self.pen = pen
+        self.canvas = pen.screen.getcanvas()
+
+    def create(self, cell, color):
+        self.pen.goto(self.camera.to_screen(cell))
+        self.pen.color(color)
+        stamp_ids = []
+        for size in GLOW_SIZES:
+            self.pen.shapesize(size, size)
+            stamp_ids.append(self.pen.stamp())
+        return stamp_ids
+
+    def recolor(self, stamp_ids, color):
+        for stamp_id in stamp_ids:
+            self.canvas.itemconfig(stamp_id, fill=color, outline=color)
+
+    def remove(self, stamp_ids):
+        for stamp_id in stamp_ids:
+            self.pen.clearstamp(stamp_id)
+
+    def remove_all(self):
+        self.pen.clearstamps()
+
+
+class SnakeRectRenderer(SegmentRenderer):
+    """Canvas backend: each segment is one rectangle item.
+
+    Items are never deleted. A freed rectangle is hidden and later moved to
+    the next new head with coords(), so a tick costs two item updates.
+    """
+
+    def __init__(self, canvas, color_func, camera):
+        super().__init__(color_func, camera)
+        self.canvas = canvas
+        # The size of the outer glow stamp of the turtle look
+        self.half = camera.segment_size * GLOW_SIZES[0] / 2
+        self.spare = []
+
+    def create(self, cell, color):
+        x, y = self.camera.to_screen(cell)
+        half = self.half
+        # Canvas y grows downward
+        box = (x - half, -y - half, x + half, -y + half)
+        if self.spare:
+            item = self.spare.pop()
+            self.canvas.coords(item, *box)
+            self.canvas.itemconfig(item, fill=color, outline=color, state="normal")
+        else:
+            item = self.canvas.create_rectangle(*box, fill=color, outline=color)
+        return item
+
+    def recolor(self, item, color):
+        self.canvas.itemconfig(item, fill=color, outline=color)
+
+    def remove(self, item):
+        self.canvas.itemconfig(item, state="hidden")
+        self.spare.append(item)
+
+    def remove_all(self):
+        for segment in self.segments.values():
+            self.remove(segment[1])
+
+
+class SnakeCellRenderer(SegmentRenderer):
+    """Terminal backend: each segment is one character cell of a TerminalDisplay."""
+
+    smooth = False
+
+    def __init__(self, terminal, color_func, camera):
+        super().__init__(color_func, camera)
+        self.terminal = terminal
+
+    def create(self, cell, color):
+        pos = self.camera.to_screen(cell)
+        self.terminal.put(pos, self.terminal.SEGMENT, color)
+        return pos
+
+    def recolor(self, pos, color):
+        self.terminal.put(pos, self.terminal.SEGMENT, color)
+
+    def remove(self, pos):
+        self.terminal.erase(pos)
+
+    def remove_all(self):
+        for segment in self.segments.values():
+            self.remove(segment[1])
+
+
+def grid_image(canvas, width, height, spacing, color, dot_size=2):
+    key = (canvas.tk, width, height, spacing, color, dot_size)
+    image = _grid_images.get(key)
+    if image is None:
+        image = tkinter.PhotoImage(master=canvas, width=width, height=height)
+        half = dot_size // 2
+        for x in range(0, width, spacing):
+            for y in range(height, 0, -spacing):
+                # Same dots as turtle.dot(dot_size) at (x - width/2, height/2 - y)
+                box = (max(x - half, 0), max(y - half, 0),
+                       min(x - half + dot_size, width), min(y - half + dot_size, height))
+                if box[0] < box[2] and box[1] < box[3]:
+                    image.put(color, to=box)
+        _grid_images[key] = image
+    return image
+
+
+def draw_background_grid(canvas, width, height, spacing, color, item=None):
+    """Draw the dotted background as a single canvas image item and return its id."""
+    if item is not None:
+        canvas.delete(item)
+    item = canvas.create_image(0, 0, image=grid_image(canvas, width, height, spacing, color))
+    canvas.tag_lower(item)
+    return item
@@ -0,0 +1,171 @@
+"""Compact binary replays of a game: the seed plus the inputs, tick by tick.
+
+A replay file is a fixed header followed by append-only 6-byte events:
+
+    header  magic "SNKR", version, seed, board width/height, segment size, speed
+    event   tick (u32), kind (u8), value (u8)
+
+Only changes are written: a direction event when the applied direction differs
+from the previous tick, a speed event when the speed changes, and one end
+event. Replaying the same inputs from the same seed reproduces the game.
+
+    python replay.py replays/game.snkr                # headless, maximum speed
+    python replay.py replays/game.snkr --realtime     # paced by the recorded speeds
+    python replay.py replays/game.snkr --seek 500     # state at tick 500
+"""
+import argparse
+import mmap
+import os
+import struct
+import time
+
+from engine import DIRECTIONS, SPEED_LEVELS, SnakeEngine
+
+MAGIC = b"SNKR"
+VERSION = 2
+HEADER = struct.Struct("<4sBQIIHB")
+EVENT = struct.Struct("<IBB")
+
+EVENT_DIRECTION = 0
+EVENT_SPEED = 1
+EVENT_END = 2
+
+DIRECTION_NAMES = list(DIRECTIONS)
+SPEED_NAMES = list(SPEED_LEVELS)
+
+
+class ReplayError(Exception):
+    pass
+
+
+class ReplayRecorder:
+    """Appends the inputs of one game to a replay file."""
+
+    def __init__(self, path, engine, speed):
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, engine.seed, engine.width, engine.height,
+                                    engine.segment_size, SPEED_NAMES.index(speed)))
+        self.direction = None
+
+    @classmethod
+    def create(cls, directory, engine, speed):
+        os.makedirs(directory, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{engine.seed:x}.snkr"
+        return cls(os.path.join(directory, name), engine, speed)
+
+    def record_direction(self, tick, direction):
+        if direction != self.direction:
+            self.direction = direction
+            self.file.write(EVENT.pack(tick, EVENT_DIRECTION, DIRECTION_NAMES.index(direction)))
+
+    def record_speed(self, tick, speed):
+        self.file.write(EVENT.pack(tick, EVENT_SPEED, SPEED_NAMES.index(speed)))
+
+    def close(self, tick):
+        self.file.write(EVENT.pack(tick, EVENT_END, 0))
+        self.file.close()
+
+
+class ReplayPlayer:
+    """Re-simulates a replay file read through a memory map."""
+
+    def __init__(self, path):
+        if os.path.getsize(path) < HEADER.size:
+            raise ReplayError(f"{path}: too short for a replay header")
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.seed, self.width, self.height, self.segment_size, speed = \
+            HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ReplayError(f"{path}: not a version {VERSION} replay")
+        self.speed = SPEED_NAMES[speed]
+        # A file cut short mid-event still replays up to its last whole event
+        self.event_count = (len(self.data) - HEADER.size) // EVENT.size
+        self.end_tick = None
+        for tick, kind, _ in self.events():
+            if kind == EVENT_END:
+                self.end_tick = tick
+
+    def close(self):
+        self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def events(self):
+        data = self.data
+        end = HEADER.size + self.event_count * EVENT.size
+        for offset in range(HEADER.size, end, EVENT.size):
+            yield EVENT.unpack_from(data, offset)
+
+    def play(self, realtime=False, on_tick=None, start=0, stop=None):
+        """Run the replay and return the engine.
+
+        Ticks before start are fast-forwarded without calling on_tick. With
+        realtime the remaining ticks are paced by the recorded speed levels.
+        """
+        engine = SnakeEngine(self.width, self.height, self.segment_size)
+        engine.reset(self.seed)
+        speed = self.speed
+        direction = engine.direction
+        events = self.events()
+        pending = next(events, None)
+        deadline = None
+
+        while not engine.done and (stop is None or engine.tick < stop):
+            # Apply every input recorded for this tick
+            while pending is not None and pending[0] <= engine.tick:
+                tick, kind, value = pending
+                if kind == EVENT_DIRECTION:
+                    direction = DIRECTION_NAMES[value]
+                elif kind == EVENT_SPEED:
+                    speed = SPEED_NAMES[value]
+                elif kind == EVENT_END:
+                    return engine
+                pending = next(events, None)
+
+            engine.step(direction)
+            if engine.tick <= start:
+                continue
+            if realtime:
+                if deadline is None:
+                    deadline = time.perf_counter()
+                deadline += SPEED_LEVELS[speed] / 1000
+                time.sleep(max(0.0, deadline - time.perf_counter()))
+            if on_tick is not None:
+                on_tick(engine, speed)
+        return engine
+
+    def seek(self, tick):
+        """State of the game after tick steps, reached without any rendering."""
+        return self.play(stop=tick)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path")
+    parser.add_argument("--realtime", action="store_true", help="pace ticks like the recorded game")
+    parser.add_argument("--seek", type=int, default=0,
+                        help="fast-forward to this tick; stops there unless --realtime is given")
+    args = parser.parse_args(argv)
+
+    def show(engine, speed):
+        print(f"tick {engine.tick}  score {engine.score}  length {len(engine.snake)}  speed {speed}")
+
+    with ReplayPlayer(args.path) as player:
+        started = time.perf_counter()
+        if args.realtime:
+            engine = player.play(realtime=True, on_tick=show, start=args.seek)
+        else:
+            engine = player.play(stop=args.seek or None)
+        elapsed = time.perf_counter() - started
+    print(f"seed {player.seed:x}: tick {engine.tick}, score {engine.score}, "
+          f"length {len(engine.snake)}, done {engine.done} ({elapsed:.3f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+from array import array
+
+from engine import DIRECTIONS
+
+DIRECTION_NAMES = list(DIRECTIONS)
+
+
+class RewindBuffer:
+    """The last capacity ticks of a game as per-tick deltas, for stepping it back.
+
+    A tick is stored as the head it added, the tail cell it freed (none when
+    the snake ate) and the food, score and direction after it, in parallel
+    arrays used as a ring. Nothing is copied per tick but those few numbers,
+    so recording is cheap at any snake length and memory stays fixed. The
+    engine's random state only moves when food is placed, so it is kept for
+    the ticks that ate. The state before the oldest stored tick is kept as
+    the base, for rewinding all the way back. A game that crashed can be
+    rewound too: the crash left the snake where it was, so it is not stored
+    and undoing it counts as one tick.
+
+    Food placed after a rewind is the same as the first time round, except
+    on boards more than half covered, where the engine's free list may have
+    come back in a different order.
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.head_x = array("i", [0]) * capacity
+        self.head_y = array("i", [0]) * capacity
+        self.freed_x = array("i", [0]) * capacity
+        self.freed_y = array("i", [0]) * capacity
+        self.ate = array("b", [0]) * capacity
+        self.food_x = array("i", [0]) * capacity
+        self.food_y = array("i", [0]) * capacity
+        self.score = array("q", [0]) * capacity
+        self.direction = array("b", [0]) * capacity
+        # Ring slot of a tick that ate -> random state right after it
+        self.rng_states = {}
+        self.start = 0
+        self.count = 0
+        self.base = None
+
+    def reset(self, engine):
+        """Forget every tick and start from the engine's current state."""
+        self.start = 0
+        self.count = 0
+        self.rng_states.clear()
+        self.base = (engine.food_pos, engine.score, engine.direction, engine.rng.getstate())
+
+    def record(self, engine):
+        """Store the tick the engine just moved (a move that did not end the game)."""
+        if self.count == self.capacity:
+            # Full: the oldest tick becomes the base
+            slot = self.start
+            self.base = (self.food(slot), self.score[slot], DIRECTION_NAMES[self.direction[slot]],
+                         self.rng_states.pop(slot, self.base[3]))
+            self.start = (self.start + 1) % self.capacity
+            self.count -= 1
+        slot = (self.start + self.count) % self.capacity
+        self.count += 1
+
+        self.head_x[slot], self.head_y[slot] = engine.snake[-1]
+        if engine.freed is None:
+            self.ate[slot] = 1
+            self.rng_states[slot] = engine.rng.getstate()
+        else:
+            self.ate[slot] = 0
+            self.freed_x[slot], self.freed_y[slot] = engine.freed
+            self.rng_states.pop(slot, None)
+        self.food_x[slot], self.food_y[slot] = engine.food_pos
+        self.score[slot] = engine.score
+        self.direction[slot] = DIRECTION_NAMES.index(engine.direction)
+
+    def food(self, slot):
+        return (self.food_x[slot], self.food_y[slot])
+
+    def rewind(self, engine, ticks):
+        """Step the engine back up to ticks ticks; returns how many it went back."""
+        revived = 0
+        if ticks and engine.done and not engine.won:
+            engine.revive(self.newest_direction())
+            revived = 1
+        ticks = min(ticks - revived, self.count)
+        for _ in range(ticks):
+            self.count -= 1
+            slot = (self.start + self.count) % self.capacity
+            freed = None if self.ate[slot] else (self.freed_x[slot], self.freed_y[slot])
+            if self.count:
+                before = (self.start + self.count - 1) % self.capacity
+                food_pos, score, direction = self.food(before), self.score[before], DIRECTION_NAMES[self.direction[before]]
+            else:
+                food_pos, score, direction = self.base[:3]
+            engine.unstep((self.head_x[slot], self.head_y[slot]), freed, food_pos, score, direction)
+            self.rng_states.pop(slot, None)
+        if ticks:
+            engine.rng.setstate(self.rng_state())
+        return revived + ticks
+
+    def newest_direction(self):
+        if self.count:
+            return DIRECTION_NAMES[self.direction[(self.start + self.count - 1) % self.capacity]]
+        return self.base[2]
+
+    def rng_state(self):
+        # Random state after the newest stored tick: that of the last tick that ate
+        for i in range(self.count - 1, -1, -1):
+            state = self.rng_states.get((self.start + i) % self.capacity)
+            if state is not None:
+                return state
+        return self.base[3]
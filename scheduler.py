@@ -0,0 +1,151 @@
+import math
+import time
+from collections import deque
+
+
+class TickScheduler:
+    """Fixed-timestep tick loop scheduled against wall-clock deadlines.
+
+    The delay before the next tick is whatever is left until its deadline, so
+    the time spent ticking and drawing does not stretch the period. When the
+    loop falls behind it runs at most max_catch_up ticks back to back, renders
+    once, and drops the remaining missed ticks.
+
+    Without a frame_interval the loop renders once after every tick. With
+    one, frames run on their own deadlines between ticks and render(alpha)
+    gets how far the clock is into the current tick, 0 to 1, for drawing
+    in-between positions. Ticks always run first, and a frame is drawn right
+    after them, then the frames are spaced from it. A later frame that would
+    run into the next tick's deadline is dropped, as are frames missed while
+    behind, so a slow machine falls back to rendering once per tick.
+
+    Between stop() or pause() and the next start() or resume() nothing is
+    scheduled at all, so an idle game costs no wakeups. resume() keeps the
+    time that was left until the next tick when the loop was paused.
+    """
+
+    def __init__(self, tick, render, interval, schedule, max_catch_up=3,
+                 clock=time.perf_counter, history=120, frame_interval=None):
+        self.tick = tick
+        self.render = render
+        self.interval = interval  # Callable returning the current tick interval in ms
+        self.schedule = schedule  # schedule(callback, delay_ms), e.g. turtle.ontimer
+        self.max_catch_up = max_catch_up
+        self.clock = clock
+        self.frame_interval = frame_interval  # Frame period in ms, None to render once per tick
+
+        self.running = False
+        self.generation = 0
+        self.next_deadline = 0.0
+        self.tick_times = deque(maxlen=history)
+        self.ticks = 0
+        self.skipped = 0
+        self.next_frame = 0.0
+        self.render_cost = 0.0
+        self.frames = 0
+        self.dropped_frames = 0
+        self.paused_left = 0.0
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        # A new generation orphans any callback still pending from a previous run
+        self.generation += 1
+        self.tick_times.clear()
+        self.next_deadline = self.next_frame = self.clock()
+        self.schedule_next(self.generation)
+
+    def stop(self):
+        self.running = False
+
+    def pause(self):
+        if not self.running:
+            return
+        self.running = False
+        self.paused_left = max(0.0, self.next_deadline - self.clock())
+
+    def resume(self):
+        if self.running:
+            return
+        self.running = True
+        self.generation += 1
+        now = self.clock()
+        # The pause is not a late tick: shift the deadlines past it
+        self.next_deadline = now + self.paused_left
+        self.next_frame = now
+        self.tick_times.clear()
+        self.schedule_next(self.generation)
+
+    def schedule_next(self, generation):
+        wake = self.next_deadline if self.frame_interval is None else min(self.next_deadline, self.next_frame)
+        delay = max(0.0, wake - self.clock())
+        self.schedule(lambda: self.run(generation), math.ceil(delay * 1000))
+
+    def run(self, generation):
+        if not self.running or generation != self.generation:
+            return
+
+        now = self.clock()
+        ran = 0
+        while self.running and now >= self.next_deadline:
+            period = self.interval() / 1000
+            if ran == self.max_catch_up:
+                # Too far behind: drop the missed ticks and realign on now
+                self.skipped += int((now - self.next_deadline) / period) + 1
+                self.next_deadline = now + period
+                break
+            self.tick_times.append(now)
+            self.tick()
+            self.ticks += 1
+            ran += 1
+            self.next_deadline += period
+
+        if self.running:
+            if self.frame_interval is None:
+                if ran:
+                    self.render()
+            else:
+                now = self.clock()
+                if ran or now >= self.next_frame:
+                    self.run_frame(now, ran)
+        if self.running and generation == self.generation:
+            self.schedule_next(generation)
+
+    def run_frame(self, now, after_tick):
+        frame = self.frame_interval / 1000
+        if after_tick:
+            self.next_frame = now
+        if not after_tick and now + self.render_cost > self.next_deadline:
+            # Drawing now would delay the next tick
+            self.dropped_frames += 1
+        else:
+            period = self.interval() / 1000
+            self.render(min(1.0, max(0.0, 1 - (self.next_deadline - now) / period)))
+            done = self.clock()
+            # Up at once, down slowly: better to drop a frame too many than to make a tick late
+            cost = done - now
+            self.render_cost = cost if cost > self.render_cost else self.render_cost + (cost - self.render_cost) / 8
+            self.frames += 1
+            now = done
+        self.next_frame += frame
+        if self.next_frame <= now:
+            missed = int((now - self.next_frame) / frame) + 1
+            self.dropped_frames += missed
+            self.next_frame += missed * frame
+
+    def stats(self):
+        # statistics pulls in decimal and fractions; only load it when stats are asked for
+        import statistics
+        times = list(self.tick_times)
+        periods = [(b - a) * 1000 for a, b in zip(times, times[1:])]
+        return {
+            "nominal_ms": self.interval(),
+            "period_ms": statistics.fmean(periods) if periods else 0.0,
+            "tick_rate": 1000 / statistics.fmean(periods) if periods and any(periods) else 0.0,
+            "jitter_ms": statistics.pstdev(periods) if len(periods) > 1 else 0.0,
+            "ticks": self.ticks,
+            "skipped": self.skipped,
+            "frames": self.frames,
+            "dropped_frames": self.dropped_frames
+        }
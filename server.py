@@ -0,0 +1,356 @@
+"""Multiplayer snake server: many snakes on one board, ticked on a fixed schedule.
+
+    python server.py --board 200x150 --bots 300
+    python client.py                              # play, rendered with the turtle UI
+    python client.py --load 200 --seconds 30      # headless clients for load testing
+
+The protocol is newline-delimited JSON over TCP. A client sends turns as
+{"dir": "left"}. The server greets it with a "welcome" (its snake id and
+the board) and one full "snapshot", then sends one "tick" message per
+tick holding only what changed in it, applied in this order:
+
+    dead    [id, ...]            snakes taken off the board
+    heads   [[id, x, y], ...]    new head of every snake that moved
+    tails   [id, ...]            snakes whose tail cell was freed
+    food    [[slot, x, y], ...]  food eaten and placed again, or empty slots filled
+    spawn   {id: [[x, y], ...]}  snakes (re)entering the board, tail first
+    scores  {id: score}          scores that changed
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+from collections import Counter, deque
+
+from engine import DIRECTIONS, OPPOSITES, SEGMENT_SIZE, food_ranges
+
+
+def encode(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+
+class Snake:
+    def __init__(self, snake_id, bot=False):
+        self.id = snake_id
+        self.bot = bot
+        self.body = deque()
+        self.direction = "up"
+        self.next_direction = "up"
+        self.score = 0
+        self.alive = False
+        self.respawn_at = 0
+
+
+class World:
+    """The shared board and its rules for many snakes.
+
+    A spatial hash maps every occupied cell to the id of the snake on it, so
+    a collision with any snake, including itself, is a single lookup. As in
+    SnakeEngine the tail still counts on the tick it moves. Snakes moving
+    onto the same cell all die.
+    """
+
+    def __init__(self, width, height, segment_size=SEGMENT_SIZE, food_count=40, seed=None, respawn_ticks=20):
+        self.width = width
+        self.height = height
+        self.segment_size = segment_size
+        self.respawn_ticks = respawn_ticks
+        self.rng = random.Random(seed)
+        self.food_xs, self.food_ys = food_ranges(width, height, segment_size)
+        self.cells = {}
+        self.snakes = {}
+        self.removed = []
+        self.next_id = 1
+        self.tick = 0
+        self.food = []
+        self.food_slots = {}
+        self.empty_food = set()  # Slots that found no free cell, retried every tick
+        for slot in range(food_count):
+            self.place_food(slot)
+
+    def random_free_cell(self, tries=100):
+        xs, ys, rng = self.food_xs, self.food_ys, self.rng
+        for _ in range(tries):
+            cell = (xs[rng.randrange(len(xs))], ys[rng.randrange(len(ys))])
+            if cell not in self.cells and cell not in self.food_slots:
+                return cell
+        return None
+
+    def place_food(self, slot):
+        cell = self.random_free_cell()
+        if slot < len(self.food):
+            self.food_slots.pop(self.food[slot], None)
+            self.food[slot] = cell
+        else:
+            self.food.append(cell)
+        if cell is not None:
+            self.food_slots[cell] = slot
+            self.empty_food.discard(slot)
+        else:
+            self.empty_food.add(slot)
+        return cell
+
+    def add_snake(self, bot=False):
+        """New snake; it enters the board on the next tick."""
+        snake = Snake(self.next_id, bot)
+        self.next_id += 1
+        snake.respawn_at = self.tick
+        self.snakes[snake.id] = snake
+        return snake
+
+    def remove_snake(self, snake_id):
+        snake = self.snakes.pop(snake_id, None)
+        if snake is None:
+            return
+        for cell in snake.body:
+            del self.cells[cell]
+        self.removed.append(snake_id)
+
+    def steer(self, snake_id, direction):
+        snake = self.snakes.get(snake_id)
+        if snake is not None and direction in DIRECTIONS and direction != OPPOSITES[snake.direction]:
+            snake.next_direction = direction
+
+    def spawn(self, snake):
+        # Three cells in a column, heading up with room to move
+        size = self.segment_size
+        for _ in range(20):
+            head = self.random_free_cell()
+            if head is None:
+                return False
+            body = [(head[0], head[1] - size * 2), (head[0], head[1] - size), head]
+            ahead = (head[0], head[1] + size)
+            if all(self.in_bounds(cell) and cell not in self.cells for cell in body + [ahead]):
+                break
+        else:
+            return False
+        snake.body = deque(body)
+        for cell in body:
+            self.cells[cell] = snake.id
+        snake.direction = snake.next_direction = "up"
+        snake.score = 0
+        snake.alive = True
+        return True
+
+    def in_bounds(self, cell):
+        return -self.width/2 <= cell[0] <= self.width/2 and -self.height/2 <= cell[1] <= self.height/2
+
+    def step(self):
+        """Advance every snake one tick and return the tick's delta message."""
+        self.tick += 1
+        size = self.segment_size
+        delta = {"type": "tick", "tick": self.tick, "dead": self.removed,
+                 "heads": [], "tails": [], "food": [], "spawn": {}, "scores": {}}
+        self.removed = []
+
+        moves = {}
+        for snake in self.snakes.values():
+            if not snake.alive:
+                continue
+            if snake.bot:
+                snake.next_direction = self.bot_direction(snake)
+            snake.direction = snake.next_direction
+            dx, dy = DIRECTIONS[snake.direction]
+            head = snake.body[-1]
+            moves[snake] = (head[0] + dx * size, head[1] + dy * size)
+
+        # Collisions are checked against the board as it was before anyone moved
+        targets = Counter(moves.values())
+        crashed = [snake for snake, cell in moves.items()
+                   if cell in self.cells or targets[cell] > 1 or not self.in_bounds(cell)]
+        for snake in crashed:
+            del moves[snake]
+            for cell in snake.body:
+                del self.cells[cell]
+            snake.body.clear()
+            snake.alive = False
+            snake.respawn_at = self.tick + self.respawn_ticks
+            delta["dead"].append(snake.id)
+
+        # Slots left empty while the board was full, tried again now
+        retry = sorted(self.empty_food)
+        eaten = []
+        for snake, cell in moves.items():
+            snake.body.append(cell)
+            self.cells[cell] = snake.id
+            delta["heads"].append([snake.id, cell[0], cell[1]])
+            slot = self.food_slots.get(cell)
+            if slot is not None:
+                snake.score += 10
+                delta["scores"][snake.id] = snake.score
+                eaten.append(slot)
+            else:
+                del self.cells[snake.body.popleft()]
+                delta["tails"].append(snake.id)
+
+        for slot in eaten:
+            cell = self.place_food(slot)
+            delta["food"].append([slot, cell[0], cell[1]] if cell else [slot, None, None])
+        for slot in retry:
+            cell = self.place_food(slot)
+            if cell is not None:
+                delta["food"].append([slot, cell[0], cell[1]])
+
+        for snake in self.snakes.values():
+            if not snake.alive and snake.respawn_at <= self.tick and self.spawn(snake):
+                delta["spawn"][snake.id] = list(snake.body)
+                delta["scores"][snake.id] = 0
+        return delta
+
+    def bot_direction(self, snake):
+        """Head for the nearest food along any move that does not crash this tick."""
+        size = self.segment_size
+        head = snake.body[-1]
+        food = [cell for cell in self.food if cell is not None]
+        target = min(food, key=lambda cell: abs(cell[0] - head[0]) + abs(cell[1] - head[1]), default=head)
+        best = None
+        for direction, (dx, dy) in DIRECTIONS.items():
+            if direction == OPPOSITES[snake.direction]:
+                continue
+            cell = (head[0] + dx * size, head[1] + dy * size)
+            if cell in self.cells or not self.in_bounds(cell):
+                continue
+            distance = abs(cell[0] - target[0]) + abs(cell[1] - target[1]) + self.rng.random()
+            if best is None or distance < best[0]:
+                best = (distance, direction)
+        return best[1] if best else snake.direction
+
+    def snapshot(self):
+        return {
+            "type": "snapshot",
+            "tick": self.tick,
+            "snakes": {snake.id: list(snake.body) for snake in self.snakes.values() if snake.alive},
+            "food": self.food,
+            "scores": {snake.id: snake.score for snake in self.snakes.values()}
+        }
+
+
+class GameServer:
+    """Runs a World on a fixed tick schedule and broadcasts each tick's delta to every client.
+
+    A delta is encoded once and the same bytes are written to every client.
+    Writes are never awaited in the tick loop; a client whose send buffer
+    backs up past max_buffer is disconnected instead of delaying the tick.
+    """
+
+    def __init__(self, world, tick_ms=100, max_buffer=1 << 20, max_catch_up=3, history=1000):
+        self.world = world
+        self.tick_ms = tick_ms
+        self.max_buffer = max_buffer
+        self.max_catch_up = max_catch_up
+        self.clients = {}
+        self.tick_costs = deque(maxlen=history)
+        self.lateness = deque(maxlen=history)
+        self.skipped = 0
+        self.dropped = 0
+
+    async def handle_client(self, reader, writer):
+        snake = self.world.add_snake()
+        world = self.world
+        writer.write(encode({"type": "welcome", "id": snake.id, "width": world.width, "height": world.height,
+                             "segment_size": world.segment_size, "tick_ms": self.tick_ms}))
+        writer.write(encode(world.snapshot()))
+        self.clients[snake.id] = writer
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(message, dict):
+                    world.steer(snake.id, message.get("dir"))
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.pop(snake.id, None)
+            world.remove_snake(snake.id)
+            writer.close()
+
+    def broadcast(self, message):
+        data = encode(message)
+        for snake_id, writer in list(self.clients.items()):
+            if writer.transport.get_write_buffer_size() > self.max_buffer:
+                del self.clients[snake_id]
+                self.dropped += 1
+                writer.close()
+                continue
+            writer.write(data)
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        interval = self.tick_ms / 1000
+        deadline = loop.time()
+        while True:
+            deadline += interval
+            delay = deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif -delay > interval * self.max_catch_up:
+                # Too far behind to catch up: drop the missed ticks and realign
+                missed = int(-delay // interval)
+                self.skipped += missed
+                deadline += missed * interval
+            started = loop.time()
+            self.lateness.append(started - deadline)
+            self.broadcast(self.world.step())
+            self.tick_costs.append(loop.time() - started)
+
+    def stats(self):
+        costs = sorted(self.tick_costs)
+        lateness = sorted(self.lateness)
+
+        def percentile(samples, fraction):
+            return samples[min(len(samples) - 1, int(len(samples) * fraction))] * 1000 if samples else 0.0
+
+        return {
+            "tick": self.world.tick,
+            "snakes": sum(snake.alive for snake in self.world.snakes.values()),
+            "clients": len(self.clients),
+            "tick_p50_ms": round(percentile(costs, 0.5), 3),
+            "tick_p99_ms": round(percentile(costs, 0.99), 3),
+            "late_p99_ms": round(percentile(lateness, 0.99), 3),
+            "skipped": self.skipped,
+            "dropped": self.dropped
+        }
+
+
+async def serve(args):
+    columns, rows = args.board
+    world = World(columns * SEGMENT_SIZE, rows * SEGMENT_SIZE, food_count=args.food, seed=args.seed)
+    for _ in range(args.bots):
+        world.add_snake(bot=True)
+    game_server = GameServer(world, args.tick_ms)
+    server = await asyncio.start_server(game_server.handle_client, args.host, args.port)
+    print(f"serving on {args.host}:{args.port}", file=sys.stderr)
+    async with server:
+        ticks = asyncio.create_task(game_server.run())
+        while args.stats_every:
+            await asyncio.sleep(args.stats_every)
+            print(json.dumps(game_server.stats()), file=sys.stderr)
+        await ticks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--board", metavar="COLSxROWS", type=lambda text: tuple(map(int, text.split("x"))),
+                        default=(200, 150))
+    parser.add_argument("--tick-ms", type=int, default=100)
+    parser.add_argument("--food", type=int, default=40)
+    parser.add_argument("--bots", type=int, default=0, help="computer-controlled snakes to add for load")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--stats-every", type=float, default=5.0, help="seconds between stats lines, 0 for none")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
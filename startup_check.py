@@ -0,0 +1,97 @@
+"""Measure launch-to-first-frame time of the game and fail when it is over budget.
+
+    python startup_check.py                           # python v2.py, median of 5 launches
+    python startup_check.py --exe dist/v2/v2          # the PyInstaller build of v2.spec
+    python startup_check.py --budget-ms 800 -o startup.json
+
+Each launch runs with --startup-report - --exit-after-startup. The wall time
+is taken from spawning the process to the game printing its report after the
+first frame, so it includes what the game cannot see itself: the interpreter
+starting and a frozen build unpacking. On Linux without a display the game
+is run under xvfb-run. Exits with status 1 when the median is over budget.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def game_command(args, scores_path):
+    if args.exe:
+        command = [args.exe]
+    else:
+        command = [sys.executable, os.path.join(HERE, args.script)]
+    command += ["--startup-report", "-", "--exit-after-startup", "--renderer", args.renderer,
+                "--scores", scores_path]
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        xvfb_run = shutil.which("xvfb-run")
+        if xvfb_run is None:
+            sys.exit("no DISPLAY and no xvfb-run; install xvfb or run under a display")
+        command = [xvfb_run, "-a"] + command
+    return command
+
+
+def launch(command):
+    """One launch; returns the wall time to the first frame in ms and the game's own report."""
+    started = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    # The report is printed right after the first frame, so its first line marks it
+    first_line = process.stdout.readline()
+    wall_ms = (time.perf_counter() - started) * 1000
+    rest = process.stdout.read()
+    if process.wait() != 0 or not first_line:
+        sys.exit(f"{' '.join(command)} failed with status {process.returncode}")
+    return wall_ms, json.loads(first_line + rest)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--exe", metavar="PATH", help="frozen executable to launch instead of python SCRIPT")
+    parser.add_argument("--script", default="v2.py", help="game script to launch with this Python (default: v2.py)")
+    parser.add_argument("--renderer", choices=["turtle", "canvas"], default="turtle")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1, help="launches not counted, to warm the disk cache")
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="largest allowed median wall time")
+    parser.add_argument("-o", "--output", metavar="PATH", help="also write the summary as JSON to PATH")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        command = game_command(args, os.path.join(tmp, "scores"))
+        for _ in range(args.warmup):
+            launch(command)
+        results = [launch(command) for _ in range(args.runs)]
+
+    walls = sorted(wall_ms for wall_ms, report in results)
+    phases = {phase: round(statistics.median(report["phases_ms"][phase] for wall_ms, report in results), 3)
+              for phase in results[0][1]["phases_ms"]}
+    median_ms = statistics.median(walls)
+    summary = {
+        "command": command,
+        "runs": len(walls),
+        "wall_median_ms": round(median_ms, 3),
+        "wall_min_ms": round(walls[0], 3),
+        "wall_max_ms": round(walls[-1], 3),
+        # Launch time the game itself cannot see: interpreter start, unpacking, xvfb-run
+        "outside_ms": round(median_ms - statistics.median(report["total_ms"] for wall_ms, report in results), 3),
+        "phases_median_ms": phases,
+        "budget_ms": args.budget_ms,
+        "ok": median_ms <= args.budget_ms
+    }
+    text = json.dumps(summary, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    if not summary["ok"]:
+        sys.exit(f"startup median {median_ms:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,21 @@
-import turtle
-import random
-import math
-import colorsys
+import time
+
+LAUNCHED = time.perf_counter()
+
+import argparse
+import os
+
+from autopilot import Autopilot
+from colors import ColorCache, GRADIENT_STEPS, HUE_STEPS, hsv_hex, rgb_hex
+from controls import InputQueue
+from displays import DISPLAYS
+from engine import SnakeEngine, SPEED_LEVELS
+from highscores import DEFAULT_PATH, HighScore, HighScoreStore
+from profiler import FrameProfiler, StartupTimer
+from renderers import Camera
+from replay import ReplayRecorder
+from rewind import RewindBuffer
+from scheduler import TickScheduler
 
 # Constants
 WIDTH = 800
@@ -9,303 +23,436 @@ HEIGHT = 600
 FOOD_SIZE = 12
 SEGMENT_SIZE = 20
 GRADIENT_COLORS = [(46, 204, 113), (52, 152, 219), (155, 89, 182), (52, 73, 94)]
+REWIND_SECONDS = 3
 
 class SnakeGame:
-    def __init__(self):
-        self.score = 0
+    def __init__(self, record_dir=None, autopilot=False, profile_out=None, board=None, renderer="turtle",
+                 scores_path=None, player="player", startup=None, fps=60):
+        board_width, board_height = (board[0] * SEGMENT_SIZE, board[1] * SEGMENT_SIZE) if board else (WIDTH, HEIGHT)
+        self.startup = startup or StartupTimer(LAUNCHED)
+        self.engine = SnakeEngine(board_width, board_height, SEGMENT_SIZE)
+        self.display = DISPLAYS[renderer](WIDTH, HEIGHT, "Neon Snake", "#1a1a1a")
+        self.startup.mark("window")
+        self.camera = Camera(self.display.width, self.display.height, board_width, board_height, SEGMENT_SIZE)
         self.highest_score = 0
-        self.snake = []
-        self.food_pos = None
+        self.player = player
+        self.highscores = HighScoreStore(scores_path) if scores_path else None
+        if self.highscores:
+            self.highscores.start()
+        self.color_cache = ColorCache()
         self.snake_direction = "up"
+        self.input_queue = InputQueue()
         self.game_started = False
         self.paused = False
+        self.resetting = False
+        self.resets = 0
+        self.final_score = None
         self.food_hue = 0.0
         
-        self.speed_levels = {
-            "Slow": 180,
-            "Normal": 130,
-            "Fast": 80,
-            "Ultra": 50
-        }
+        self.speed_levels = dict(SPEED_LEVELS)
         self.current_speed = "Normal"
+        self.record_dir = record_dir
+        self.recorder = None
+        self.history = RewindBuffer()
+        self.autopilot = Autopilot(self.engine) if autopilot else None
+        self.profiler = FrameProfiler()
+        self.profile_out = profile_out
+        self.profile_refreshes = 0
+        self.profile_next = 0.0
+        self.effects = []
+        self.scheduler = TickScheduler(
+            self.move_snake,
+            self.render_frame,
+            lambda: self.speed_levels[self.current_speed],
+            self.display.ontimer,
+            frame_interval=1000 / fps if fps else None
+        )
         
-        self.setup_screen()
+        self.create_background_pattern()
+        self.startup.mark("background")
         self.create_objects()
+        self.setup_profiler()
         self.setup_events()
         self.reset_game()
         self.add_credits()
+        self.startup.mark("objects")
 
-    def setup_screen(self):
-        self.screen = turtle.Screen()
-        self.screen.setup(WIDTH, HEIGHT)
-        self.screen.title("Neon Snake")
-        self.screen.bgcolor("#1a1a1a")
-        self.screen.tracer(0)
-        
-        self.bg_pattern = turtle.Turtle()
-        self.bg_pattern.hideturtle()
-        self.bg_pattern.penup()
-        self.create_background_pattern()
+    @property
+    def snake(self):
+        return self.engine.snake
+
+    @property
+    def score(self):
+        return self.engine.score
+
+    @property
+    def food_pos(self):
+        return self.engine.food_pos
 
     def add_credits(self):
-        self.credits = turtle.Turtle()
-        self.credits.penup()
-        self.credits.hideturtle()
-        self.credits.color("#666666")
-        self.credits.goto(0, -HEIGHT/2 + 10)
-        self.credits.write("Created by Chamindu Kavishka", 
-                          align="center", 
-                          font=("Arial", 10, "italic"))
+        self.display.write("credits", "Created by Chamindu Kavishka", (0, -HEIGHT/2 + 10),
+                           "#666666", ("Arial", 10, "italic"))
 
     def create_background_pattern(self):
-        self.bg_pattern.clear()
-        self.bg_pattern.penup()
-        self.bg_pattern.color("#2c3e50")
-        
-        for x in range(-WIDTH//2, WIDTH//2, 40):
-            for y in range(-HEIGHT//2, HEIGHT//2, 40):
-                self.bg_pattern.goto(x, y)
-                self.bg_pattern.dot(2)
+        self.display.draw_background(40, "#2c3e50")
 
     def create_objects(self):
-        self.pen = turtle.Turtle()
-        self.pen.penup()
-        self.pen.shape("square")
-        self.pen.hideturtle()
-        
-        self.food = turtle.Turtle()
-        self.food.shape("circle")
-        self.food.shapesize(FOOD_SIZE/20)
-        self.food.penup()
-        self.food.hideturtle()
-        
-        self.food_glow = turtle.Turtle()
-        self.food_glow.shape("circle")
-        self.food_glow.penup()
-        self.food_glow.hideturtle()
-        
-        self.score_display = turtle.Turtle()
-        self.score_display.color("#ecf0f1")
-        self.score_display.penup()
-        self.score_display.hideturtle()
-        self.score_display.goto(0, HEIGHT/2 - 40)
-        
-        self.message_display = turtle.Turtle()
-        self.message_display.color("#ecf0f1")
-        self.message_display.penup()
-        self.message_display.hideturtle()
-        
-        self.instructions = turtle.Turtle()
-        self.instructions.color("#bdc3c7")
-        self.instructions.penup()
-        self.instructions.hideturtle()
-        self.instructions.goto(0, -HEIGHT/2 + 30)
+        self.snake_renderer = None
+        self.glow_sizes = [FOOD_SIZE * (1.5 - i * 0.2) for i in range(3)]
 
     def update_food_color(self):
         self.food_hue += 0.01
         if self.food_hue > 1.0:
             self.food_hue = 0.0
             
-        rgb = colorsys.hsv_to_rgb(self.food_hue, 1.0, 1.0)
-        color = f"#{int(rgb[0]*255):02x}{int(rgb[1]*255):02x}{int(rgb[2]*255):02x}"
+        hue_step = round(self.food_hue * HUE_STEPS)
+        color = self.color_cache.get(("food", hue_step), hsv_hex, hue_step / HUE_STEPS, 1.0, 1.0)
+        glow_color = self.color_cache.get(("glow", hue_step), hsv_hex, hue_step / HUE_STEPS, 0.3, 0.5)  # Less saturated and darker
         
         # Update main food color
-        self.food.color(color)
-        
-        # Create glow effect with larger circles
-        self.food_glow.clear()
-        self.food_glow.goto(self.food_pos)
+        self.display.color_food(color)
         
-        # Create multiple circles with decreasing intensity
-        for i in range(3):
-            size = FOOD_SIZE * (1.5 - i * 0.2)
-            rgb_glow = colorsys.hsv_to_rgb(self.food_hue, 0.3, 0.5)  # Less saturated and darker
-            glow_color = f"#{int(rgb_glow[0]*255):02x}{int(rgb_glow[1]*255):02x}{int(rgb_glow[2]*255):02x}"
-            self.food_glow.color(glow_color)
-            self.food_glow.shapesize(size/20)
-            self.food_glow.stamp()
+        # Create glow effect with larger circles, recolored in place until the food moves
+        if self.food_pos is not None and self.camera.visible(self.food_pos):
+            self.display.show_glow(self.camera.to_screen(self.food_pos), self.glow_sizes, glow_color)
+        else:
+            self.display.show_glow(None, self.glow_sizes, glow_color)
+
+    def setup_profiler(self):
+        self.profiler.instrument(self.scheduler, "tick", "logic")
+        self.profiler.instrument(self, "draw_snake", "draw")
+        self.profiler.instrument(self, "update_food_color", "food_color")
+        self.profiler.instrument(self.display, "update", "update")
+        self.profiler.instrument(self.scheduler, "render", "frame")
+        self.profiler.add_stats("input", self.input_queue.stats)
+        self.profiler.add_stats("scheduler", self.scheduler.stats)
+        self.profiler.add_stats("colors", self.color_cache.stats)
+        if self.profile_out:
+            self.toggle_profiler()
+
+    def toggle_profiler(self):
+        if self.profiler.enabled:
+            self.profiler.disable()
+            self.display.clear_text("profile")
+        else:
+            self.profiler.enable()
+            self.profile_refreshes = 0
+            self.profile_next = 0.0
+            self.refresh_profiler()
+
+    def refresh_profiler(self):
+        now = self.scheduler.clock()
+        if not self.profiler.enabled or now < self.profile_next:
+            return
+        self.profile_next = now + 0.5
+        self.profile_refreshes += 1
+        self.display.write("profile", self.profiler.overlay_text(), (WIDTH/2 - 20, HEIGHT/2 - 60),
+                           "#95a5a6", ("Arial", 10, "normal"), align="right")
+        # Overlay every 0.5 s, metrics file every 5 s
+        if self.profile_out and self.profile_refreshes % 10 == 0:
+            self.profiler.dump(self.profile_out)
 
     def interpolate_color(self, color1, color2, fraction):
         return tuple(int(c1 + (c2 - c1) * fraction) for c1, c2 in zip(color1, color2))
 
-    def get_segment_color(self, index, total_segments):
-        gradient_position = index / total_segments
+    def compute_segment_color(self, gradient_position):
         color_index = int(gradient_position * (len(GRADIENT_COLORS) - 1))
         next_color_index = min(color_index + 1, len(GRADIENT_COLORS) - 1)
         
         fraction = gradient_position * (len(GRADIENT_COLORS) - 1) - color_index
         color = self.interpolate_color(GRADIENT_COLORS[color_index], GRADIENT_COLORS[next_color_index], fraction)
-        return f"#{color[0]:02x}{color[1]:02x}{color[2]:02x}"
+        return rgb_hex(color)
 
-    def draw_snake(self):
-        self.pen.clearstamps()
-        
-        for i, segment in enumerate(self.snake):
-            self.pen.goto(segment[0], segment[1])
-            self.pen.color(self.get_segment_color(i, len(self.snake)))
-            
-            for size in [1.1, 1.0]:
-                self.pen.shapesize(size, size)
-                self.pen.stamp()
+    def get_segment_color(self, index, total_segments):
+        # Snap the gradient position to GRADIENT_STEPS so colors come from the cache
+        step = index * GRADIENT_STEPS // total_segments
+        return self.color_cache.get(("segment", step), self.compute_segment_color, step / GRADIENT_STEPS)
+
+    def draw_snake(self, alpha=1.0):
+        if self.snake_renderer is None:
+            self.snake_renderer = self.display.snake_renderer(self.get_segment_color, self.camera)
+        self.snake_renderer.draw(self.snake, self.engine.occupied, alpha, self.engine.freed)
+
+    def clear_snake(self):
+        if self.snake_renderer is not None:
+            self.snake_renderer.clear()
+
+    def place_food(self):
+        if self.food_pos is not None and self.camera.visible(self.food_pos):
+            self.display.show_food(self.camera.to_screen(self.food_pos), FOOD_SIZE)
+        else:
+            self.display.show_food(None, FOOD_SIZE)
 
     def move_snake(self):
         if self.paused or not self.game_started:
-            turtle.ontimer(self.move_snake, self.speed_levels[self.current_speed])
             return
 
         self.update_food_color()
 
-        new_head = self.snake[-1].copy()
-        new_head[0] += {
-            "up": (0, SEGMENT_SIZE),
-            "down": (0, -SEGMENT_SIZE),
-            "left": (-SEGMENT_SIZE, 0),
-            "right": (SEGMENT_SIZE, 0)
-        }[self.snake_direction][0]
-        new_head[1] += {
-            "up": (0, SEGMENT_SIZE),
-            "down": (0, -SEGMENT_SIZE),
-            "left": (-SEGMENT_SIZE, 0),
-            "right": (SEGMENT_SIZE, 0)
-        }[self.snake_direction][1]
-
-        if (new_head in self.snake or 
-            new_head[0] < -WIDTH/2 or new_head[0] > WIDTH/2 or 
-            new_head[1] < -HEIGHT/2 or new_head[1] > HEIGHT/2):
+        # Take at most one buffered turn per tick
+        turn = self.input_queue.pop(self.engine.direction)
+        if turn:
+            self.snake_direction = turn
+        if self.autopilot:
+            self.snake_direction = self.autopilot.next_direction()
+        if self.recorder:
+            self.recorder.record_direction(self.engine.tick, self.snake_direction)
+        state = self.engine.step(self.snake_direction)
+        if state.done:
             self.game_over()
             return
+        self.history.record(self.engine)
 
-        self.snake.append(new_head)
-        
-        if self.get_distance(new_head, self.food_pos) < SEGMENT_SIZE:
-            self.score += 10
-            self.food_pos = self.get_random_food_pos()
-            self.food.goto(self.food_pos)
+        if state.ate:
+            self.place_food()
             self.update_score()
             self.spawn_food_effect()
-        else:
-            self.snake.pop(0)
 
-        self.draw_snake()
-        self.screen.update()
-        turtle.ontimer(self.move_snake, self.speed_levels[self.current_speed])
+    def render_frame(self, alpha=1.0):
+        if self.paused or not self.game_started:
+            return
+        if self.camera.follow(self.snake[-1]):
+            self.place_food()
+        self.draw_snake(alpha)
+        self.draw_effects()
+        self.refresh_profiler()
+        self.display.update()
 
     def spawn_food_effect(self):
-        effect = turtle.Turtle()
-        effect.penup()
-        effect.hideturtle()
-        effect.goto(self.food_pos)
-        
-        def pulse(size, intensity):
-            if size > 30:
-                effect.clear()
-                effect.reset()
-                return
-            
-            effect.clear()
-            rgb = colorsys.hsv_to_rgb(self.food_hue, intensity, 1.0)
-            color = f"#{int(rgb[0]*255):02x}{int(rgb[1]*255):02x}{int(rgb[2]*255):02x}"
-            effect.color(color)
-            effect.dot(size)
-            self.screen.update()
-            turtle.ontimer(lambda: pulse(size + 2, intensity * 0.9), 50)
-        
-        pulse(FOOD_SIZE, 1.0)
+        effect = self.display.start_effect()
+        if effect is None:
+            return
+        self.effects.append([effect, self.camera.to_screen(self.food_pos), self.scheduler.clock(), None])
 
-    def get_random_food_pos(self):
-        while True:
-            x = random.randint(-WIDTH//2 + SEGMENT_SIZE, WIDTH//2 - SEGMENT_SIZE)
-            x = x - (x % SEGMENT_SIZE)
-            y = random.randint(-HEIGHT//2 + SEGMENT_SIZE, HEIGHT//2 - SEGMENT_SIZE)
-            y = y - (y % SEGMENT_SIZE)
-            if [x, y] not in self.snake:
-                return (x, y)
+    def draw_effects(self):
+        # Pulses are advanced on the frame tick: 2 px bigger and fainter every 50 ms
+        now = self.scheduler.clock()
+        hue_step = round(self.food_hue * HUE_STEPS)
+        for pulse in list(self.effects):
+            effect, pos, started, drawn = pulse
+            step = int((now - started) / 0.05)
+            size = FOOD_SIZE + step * 2
+            if size > 30:
+                self.display.end_effect(effect)
+                self.effects.remove(pulse)
+            elif step != drawn:
+                pulse[3] = step
+                intensity = 0.9 ** step
+                color = self.color_cache.get(("pulse", hue_step, round(intensity, 3)), hsv_hex, hue_step / HUE_STEPS, intensity, 1.0)
+                self.display.draw_effect(effect, pos, size, color)
 
-    def get_distance(self, pos1, pos2):
-        return math.sqrt((pos1[0] - pos2[0])**2 + (pos1[1] - pos2[1])**2)
+    def clear_effects(self):
+        for effect, pos, started, drawn in self.effects:
+            self.display.end_effect(effect)
+        self.effects.clear()
 
     def update_score(self):
-        self.score_display.clear()
-        self.score_display.write(
+        if self.highscores:
+            self.highest_score = max(self.highest_score, self.highscores.best())
+        self.display.write(
+            "score",
             f"Score: {self.score}  |  High Score: {self.highest_score}  |  Speed: {self.current_speed}", 
-            align="center", 
-            font=("Arial", 16, "bold")
+            (0, HEIGHT/2 - 40),
+            "#ecf0f1",
+            ("Arial", 16, "bold")
         )
 
     def show_message(self, message, y_pos=0, color="#ecf0f1", size=24):
-        self.message_display.clear()
-        self.message_display.color(color)
-        self.message_display.goto(0, y_pos)
-        self.message_display.write(message, align="center", font=("Arial", size, "bold"))
+        self.display.write("message", message, (0, y_pos), color, ("Arial", size, "bold"))
 
     def show_instructions(self):
-        self.instructions.clear()
-        self.instructions.write(
-            "Arrow Keys: Move  |  P: Pause  |  Speed (1-4): Slow/Normal/Fast/Ultra  |  Press SPACE to Start", 
-            align="center", 
-            font=("Arial", 12)
+        self.display.write(
+            "instructions",
+            "Press SPACE to Start  |  Arrow Keys: Move  |  P: Pause  |  R: Rewind  |  1-4: Speed",
+            (0, -HEIGHT/2 + 48),
+            "#bdc3c7",
+            ("Arial", 12)
+        )
+        self.display.write(
+            "keys",
+            "A: Autopilot  |  L: Leaderboard  |  F: Profiler",
+            (0, -HEIGHT/2 + 30),
+            "#bdc3c7",
+            ("Arial", 12)
         )
 
     def game_over(self):
-        if self.score > self.highest_score:
-            self.highest_score = self.score
-        self.show_message("GAME OVER!", color="#e74c3c")
+        self.final_score = HighScore(self.player, self.score, len(self.snake), self.current_speed, time.time())
+        rank = self.highscores.rank(self.final_score) if self.highscores else None
+        if self.engine.won:
+            self.show_message("YOU WIN!", color="#2ecc71")
+        elif rank and self.score:
+            self.show_message(f"GAME OVER!  #{rank} on the leaderboard", color="#f1c40f")
+        else:
+            self.show_message("GAME OVER!", color="#e74c3c")
         self.game_started = False
-        turtle.ontimer(self.reset_game, 2000)
+        self.scheduler.stop()
+        self.clear_effects()
+        if self.recorder:
+            self.recorder.close(self.engine.tick)
+            self.recorder = None
+        self.resetting = True
+        self.resets += 1
+        resets = self.resets
+        self.display.ontimer(lambda: self.reset_game(resets), 2000)
 
-    def reset_game(self):
-        self.snake = [[0, 0], [0, SEGMENT_SIZE], [0, SEGMENT_SIZE * 2]]
-        self.snake_direction = "up"
-        self.score = 0
-        self.food_pos = self.get_random_food_pos()
-        self.food.goto(self.food_pos)
-        self.food.showturtle()
+    def reset_game(self, resets=None):
+        if resets is not None and resets != self.resets:
+            return
+        self.resetting = False
+        self.save_score()
+        self.engine.reset()
+        self.history.reset(self.engine)
+        self.clear_snake()
+        self.snake_direction = self.engine.direction
+        self.input_queue.clear()
+        self.camera.reset()
+        self.place_food()
         self.update_score()
         self.show_instructions()
         if not self.game_started:
             self.show_message("Press SPACE to Start!", y_pos=50, size=20, color="#2ecc71")
-        self.screen.update()
+        self.display.update()
+        if self.autopilot:
+            self.start_game()
+
+    def save_score(self):
+        if self.final_score is None:
+            return
+        entry, self.final_score = self.final_score, None
+        self.highest_score = max(self.highest_score, entry.score)
+        if self.highscores:
+            self.highscores.add(entry)
 
     def start_game(self):
-        if not self.game_started:
+        if not self.game_started and not self.resetting:
             self.game_started = True
-            self.message_display.clear()
-            self.move_snake()
+            self.display.clear_text("message")
+            if self.record_dir:
+                self.recorder = ReplayRecorder.create(self.record_dir, self.engine, self.current_speed)
+            self.scheduler.start()
+
+    def show_leaderboard(self):
+        if not self.highscores:
+            return
+        entries = self.highscores.top(wait=False)[:5]
+        text = "  |  ".join(f"{rank}. {entry.name} {entry.score}" for rank, entry in enumerate(entries, 1))
+        self.show_message(text or "No high scores yet", y_pos=-50, size=14, color="#f1c40f")
 
     def toggle_pause(self):
         if self.game_started:
             self.paused = not self.paused
             if self.paused:
+                self.scheduler.pause()
                 self.show_message("PAUSED", y_pos=50, size=20, color="#f1c40f")
             else:
-                self.message_display.clear()
+                self.display.clear_text("message")
+                self.scheduler.resume()
+
+    def rewind(self):
+        if not (self.game_started or self.resetting) or self.engine.won:
+            return
+        tick = self.engine.tick
+        ticks = round(REWIND_SECONDS * 1000 / self.speed_levels[self.current_speed])
+        if not self.history.rewind(self.engine, ticks):
+            return
+        if self.resetting:
+            self.resetting = False
+            self.resets += 1
+            self.final_score = None
+            self.game_started = True
+            self.paused = True
+            self.scheduler.start()
+            self.scheduler.pause()
+            self.show_message("PAUSED", y_pos=50, size=20, color="#f1c40f")
+        if self.recorder:
+            self.recorder.close(tick)
+            self.recorder = None
+        self.snake_direction = self.engine.direction
+        self.input_queue.clear()
+        if self.autopilot:
+            self.autopilot.clear()
+        self.camera.follow(self.snake[-1])
+        self.clear_snake()
+        self.place_food()
+        self.update_food_color()
+        self.update_score()
+        self.draw_snake()
+        self.display.update()
+
+    def toggle_autopilot(self):
+        if self.autopilot:
+            self.autopilot = None
+        else:
+            self.autopilot = Autopilot(self.engine)
+            self.start_game()
 
     def set_speed(self, speed):
         self.current_speed = speed
+        if self.recorder:
+            self.recorder.record_speed(self.engine.tick, speed)
         self.update_score()
 
     def setup_events(self):
-        self.screen.listen()
-        self.screen.onkey(lambda: self.set_direction("up"), "Up")
-        self.screen.onkey(lambda: self.set_direction("down"), "Down")
-        self.screen.onkey(lambda: self.set_direction("left"), "Left")
-        self.screen.onkey(lambda: self.set_direction("right"), "Right")
-        self.screen.onkey(self.start_game, "space")
-        self.screen.onkey(self.toggle_pause, "p")
-        self.screen.onkey(lambda: self.set_speed("Slow"), "1")
-        self.screen.onkey(lambda: self.set_speed("Normal"), "2")
-        self.screen.onkey(lambda: self.set_speed("Fast"), "3")
-        self.screen.onkey(lambda: self.set_speed("Ultra"), "4")
+        self.display.onkey(lambda: self.set_direction("up"), "Up")
+        self.display.onkey(lambda: self.set_direction("down"), "Down")
+        self.display.onkey(lambda: self.set_direction("left"), "Left")
+        self.display.onkey(lambda: self.set_direction("right"), "Right")
+        self.display.onkey(self.start_game, "space")
+        self.display.onkey(self.toggle_pause, "p")
+        self.display.onkey(self.toggle_autopilot, "a")
+        self.display.onkey(self.toggle_profiler, "f")
+        self.display.onkey(self.show_leaderboard, "l")
+        self.display.onkey(self.rewind, "r")
+        self.display.onkey(lambda: self.set_speed("Slow"), "1")
+        self.display.onkey(lambda: self.set_speed("Normal"), "2")
+        self.display.onkey(lambda: self.set_speed("Fast"), "3")
+        self.display.onkey(lambda: self.set_speed("Ultra"), "4")
+
+    def finish_startup(self, report_path, exit_after):
+        self.display.update()
+        self.startup.mark("first_frame")
+        if report_path:
+            self.startup.dump(report_path)
+        if exit_after:
+            self.display.quit()
 
     def set_direction(self, direction):
         if self.game_started and not self.paused:
-            opposites = {"up": "down", "down": "up", "left": "right", "right": "left"}
-            if self.snake_direction != opposites[direction]:
-                self.snake_direction = direction
+            self.input_queue.push(direction, self.engine.direction)
 
 def main():
-    game = SnakeGame()
-    turtle.done()
+    parser = argparse.ArgumentParser(description="Neon Snake")
+    parser.add_argument("--record", metavar="DIR", help="save a replay of every game into DIR; "
+                        "a replay ends at a rewind or at the game's first crash")
+    parser.add_argument("--autopilot", action="store_true", help="let the computer play, restarting after every game")
+    parser.add_argument("--profile-out", metavar="PATH",
+                        help="profile every frame and dump p50/p95/p99 to PATH (.prom for Prometheus, else JSON)")
+    parser.add_argument("--board", metavar="COLSxROWS", type=lambda text: tuple(map(int, text.split("x"))),
+                        help="play on a board of this many cells with a camera following the head (default: the window)")
+    parser.add_argument("--renderer", choices=DISPLAYS, default="turtle",
+                        help="turtle (the classic look), canvas (plain Tk canvas items) or terminal (curses, works over SSH)")
+    parser.add_argument("--scores", metavar="PATH", default=DEFAULT_PATH, help="leaderboard file (default: %(default)s)")
+    parser.add_argument("--name", help="your name on the leaderboard (default: your login name)")
+    parser.add_argument("--fps", type=int, default=60,
+                        help="frames per second, drawn between ticks; 0 draws once per tick (default: %(default)s)")
+    parser.add_argument("--startup-report", metavar="PATH",
+                        help="write launch-to-first-frame timings as JSON to PATH (- for stdout)")
+    parser.add_argument("--exit-after-startup", action="store_true", help="quit once the first frame is drawn")
+    args = parser.parse_args()
+    startup = StartupTimer(LAUNCHED)
+    startup.mark("imports")
+
+    game = SnakeGame(record_dir=args.record, autopilot=args.autopilot, profile_out=args.profile_out,
+                     board=args.board, renderer=args.renderer, scores_path=args.scores, fps=args.fps,
+                     player=args.name or os.environ.get("USER") or os.environ.get("USERNAME") or "player",
+                     startup=startup)
+    if args.startup_report or args.exit_after_startup:
+        game.display.ontimer(lambda: game.finish_startup(args.startup_report, args.exit_after_startup), 0)
+    game.display.mainloop()
+    game.save_score()
+    if game.highscores:
+        game.highscores.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,5 +1,21 @@
 # -*- mode: python ; coding: utf-8 -*-
 
+# A onefile exe unpacks the whole bundle to a temp dir on every launch, which
+# is most of its cold start. The default is a folder build that starts in
+# place; set ONEFILE = True for a single-file download instead.
+ONEFILE = False
+
+# Standard library packages the game never imports. Leaving them out keeps
+# the archive the bootloader opens small.
+EXCLUDES = [
+    'asyncio', 'concurrent', 'multiprocessing', 'socket', 'selectors', 'ssl',
+    'email', 'http', 'urllib', 'xml', 'xmlrpc', 'html', 'ftplib', 'smtplib',
+    'sqlite3', 'lzma', 'bz2', 'tarfile', 'csv',
+    'unittest', 'doctest', 'pdb', 'pydoc', 'pydoc_data', 'test', 'tkinter.test',
+    'idlelib', 'turtledemo', 'lib2to3', 'distutils', 'setuptools', 'pkg_resources',
+    # Other entry points of this repo
+    'server', 'client', 'batch', 'bench', 'startup_check',
+]
 
 a = Analysis(
     ['v2.py'],
@@ -10,23 +26,24 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=EXCLUDES,
     noarchive=False,
     optimize=0,
 )
 pyz = PYZ(a.pure)
 
+# UPX makes the files smaller but every launch pays to decompress them
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.datas,
+    *([a.binaries, a.datas] if ONEFILE else []),
     [],
+    exclude_binaries=not ONEFILE,
     name='v2',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    upx=False,
     upx_exclude=[],
     runtime_tmpdir=None,
     console=False,
@@ -36,3 +53,14 @@ exe = EXE(
     codesign_identity=None,
     entitlements_file=None,
 )
+
+if not ONEFILE:
+    coll = COLLECT(
+        exe,
+        a.binaries,
+        a.datas,
+        strip=False,
+        upx=False,
+        upx_exclude=[],
+        name='v2',
+    )
@@ -0,0 +1,315 @@
+"""Vectorized snake environment for training agents: N boards stepped in lockstep with NumPy.
+
+    python vecenv.py --envs 256 --steps 2000    # random agents, env-steps/sec as JSON
+    python vecenv.py --check 50                 # play games against SnakeEngine, fail on any difference
+
+Needs NumPy, which the game itself does not. A step costs about the same
+for 16 boards as for 1, so throughput comes from stepping many at once.
+
+The rules are SnakeEngine's: the board edges are in bounds, the tail still
+counts on the tick it moves, food lands strictly inside the edges and each
+food is +10 reward. As in the game, a turn straight back into the neck is
+ignored. A finished board starts over the way reset_game does: three cells
+at the center heading up, score 0, new food.
+
+Observations are one preallocated array of shape (envs, 3, rows, columns),
+written in place every step and returned without copying, so an agent that
+keeps one across steps must copy it. Row 0 is the top of the board.
+
+    channel 0  every snake cell, head included
+    channel 1  the head
+    channel 2  the food
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from engine import DIRECTIONS, HEIGHT, OPPOSITES, SEGMENT_SIZE, WIDTH, SnakeEngine, food_ranges
+
+# Action i is ACTIONS[i]
+ACTIONS = list(DIRECTIONS)
+BODY, HEAD, FOOD = range(3)
+
+
+class SnakeVecEnv:
+    """envs boards of the same size, each a SnakeEngine game, stepped together.
+
+    A snake is a ring buffer of flat cell indices (row * columns + column)
+    and the body channel of the observation doubles as the occupancy grid,
+    so a step is a fixed number of array operations whatever envs is.
+    """
+
+    def __init__(self, envs, width=WIDTH, height=HEIGHT, segment_size=SEGMENT_SIZE, seed=None,
+                 max_steps=None, dtype=np.uint8):
+        self.envs = envs
+        self.width = width
+        self.height = height
+        self.segment_size = segment_size
+        self.max_steps = max_steps
+        self.rng = np.random.default_rng(seed)
+
+        # Same in-bounds cells as hamiltonian_cycle: both edges included
+        self.left = -(width//2 // segment_size) * segment_size
+        self.top = (height//2 // segment_size) * segment_size
+        self.columns = (width//2 - self.left) // segment_size + 1
+        self.rows = (self.top + height//2) // segment_size + 1
+        cells = self.rows * self.columns
+
+        food_xs, food_ys = food_ranges(width, height, segment_size)
+        self.food_cells = np.array([self.cell(x, y) for y in food_ys for x in food_xs], dtype=np.int64)
+        self.in_food_area = np.zeros(cells, dtype=bool)
+        self.in_food_area[self.food_cells] = True
+        self.start_cells = np.array([self.cell(0, 0), self.cell(0, segment_size), self.cell(0, segment_size * 2)])
+
+        self.observations = np.zeros((envs, 3, self.rows, self.columns), dtype=dtype)
+        # Flat views of the channels share memory with the observations
+        flat = self.observations.reshape(envs, 3, cells)
+        self.occupied = flat[:, BODY]
+        self.heads = flat[:, HEAD]
+        self.foods = flat[:, FOOD]
+
+        self.body = np.zeros((envs, cells), dtype=np.int64)
+        self.head_index = np.zeros(envs, dtype=np.int64)
+        self.length = np.zeros(envs, dtype=np.int64)
+        self.direction = np.zeros(envs, dtype=np.int64)
+        self.food = np.zeros(envs, dtype=np.int64)
+        self.covered = np.zeros(envs, dtype=np.int64)
+        self.score = np.zeros(envs, dtype=np.int64)
+        self.ticks = np.zeros(envs, dtype=np.int64)
+        self.rewards = np.zeros(envs, dtype=np.float32)
+        self.dones = np.zeros(envs, dtype=bool)
+        # Results of the boards that finished on the last step, before they were reset
+        self.final_score = np.zeros(envs, dtype=np.int64)
+        self.final_length = np.zeros(envs, dtype=np.int64)
+        self.won = np.zeros(envs, dtype=bool)
+        self.truncated = np.zeros(envs, dtype=bool)
+
+        self.all_envs = np.arange(envs)
+        moves = np.array([DIRECTIONS[action] for action in ACTIONS])
+        # Rows grow downward while y grows upward
+        self.move_offsets = moves[:, 1] * -self.columns + moves[:, 0]
+        self.move_rows = -moves[:, 1]
+        self.move_columns = moves[:, 0]
+        self.opposite = np.array([ACTIONS.index(OPPOSITES[action]) for action in ACTIONS])
+
+    def cell(self, x, y):
+        return (self.top - y) // self.segment_size * self.columns + (x - self.left) // self.segment_size
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self.reset_envs(self.all_envs)
+        return self.observations
+
+    def reset_envs(self, envs):
+        """Start the given boards over, like SnakeEngine.reset."""
+        if not len(envs):
+            return
+        self.observations[envs] = 0
+        start = self.start_cells
+        self.body[envs, :len(start)] = start
+        self.head_index[envs] = len(start) - 1
+        self.length[envs] = len(start)
+        self.direction[envs] = ACTIONS.index("up")
+        self.occupied[envs[:, None], start] = 1
+        self.heads[envs, start[-1]] = 1
+        self.covered[envs] = self.in_food_area[start].sum()
+        self.score[envs] = 0
+        self.ticks[envs] = 0
+        self.place_food(envs)
+
+    def place_food(self, envs, tries=8):
+        """New food for each of envs on a free cell in the food area; -1 when there is none."""
+        food_cells = self.food_cells
+        # Random draws, as in SnakeEngine.random_food_pos, while a board is at most half full
+        pending = envs[self.covered[envs] * 2 <= len(food_cells)]
+        dense = envs[self.covered[envs] * 2 > len(food_cells)]
+        for _ in range(tries):
+            if not len(pending):
+                break
+            cells = food_cells[self.rng.integers(len(food_cells), size=len(pending))]
+            free = self.occupied[pending, cells] == 0
+            self.set_food(pending[free], cells[free])
+            pending = pending[~free]
+        # Rarely left over, or a crowded board: pick among the free cells directly
+        for env in np.concatenate([pending, dense]):
+            free_cells = food_cells[self.occupied[env, food_cells] == 0]
+            if len(free_cells):
+                self.set_food(env, free_cells[self.rng.integers(len(free_cells))])
+            else:
+                self.food[env] = -1
+
+    def set_food(self, envs, cells):
+        self.food[envs] = cells
+        self.foods[envs, cells] = 1
+
+    def step(self, actions):
+        """Advance every board one tick; returns (observations, rewards, dones, info).
+
+        Boards that finish are reset within the step, so their observation is
+        already the new game's. info holds arrays, read where dones is set:
+        final_score, final_length, won and truncated (hit max_steps).
+        """
+        envs = self.all_envs
+        actions = np.asarray(actions, dtype=np.int64)
+        direction = np.where(actions == self.opposite[self.direction], self.direction, actions)
+        self.direction[:] = direction
+        self.ticks += 1
+
+        head = self.body[envs, self.head_index]
+        columns = self.columns
+        row = head // columns + self.move_rows[direction]
+        column = head % columns + self.move_columns[direction]
+        wall = (row < 0) | (row >= self.rows) | (column < 0) | (column >= columns)
+        new_head = np.where(wall, 0, head + self.move_offsets[direction])
+        # The tail has not moved yet, so running into it is a crash
+        crashed = wall | (self.occupied[envs, new_head] != 0)
+        moving = ~crashed
+        ate = moving & (new_head == self.food)
+        self.rewards[:] = np.where(ate, 10, 0)
+
+        alive = envs[moving]
+        cells = new_head[moving]
+        self.heads[alive, head[moving]] = 0
+        self.heads[alive, cells] = 1
+        self.occupied[alive, cells] = 1
+        capacity = self.body.shape[1]
+        self.head_index[alive] = (self.head_index[alive] + 1) % capacity
+        self.body[alive, self.head_index[alive]] = cells
+        self.covered[alive] += self.in_food_area[cells]
+
+        grown = envs[ate]
+        self.length[grown] += 1
+        self.score[grown] += 10
+        self.foods[grown, self.food[grown]] = 0
+        self.place_food(grown)
+        won = ate & (self.food < 0)
+
+        moved = envs[moving & ~ate]
+        tails = self.body[moved, (self.head_index[moved] - self.length[moved]) % capacity]
+        self.occupied[moved, tails] = 0
+        self.covered[moved] -= self.in_food_area[tails]
+
+        truncated = self.ticks >= self.max_steps if self.max_steps else np.zeros(self.envs, dtype=bool)
+        np.logical_or(crashed | won, truncated, out=self.dones)
+        self.won[:] = won
+        self.truncated[:] = truncated & ~crashed & ~won
+        finished = envs[self.dones]
+        self.final_score[finished] = self.score[finished]
+        self.final_length[finished] = self.length[finished]
+        self.reset_envs(finished)
+
+        info = {"final_score": self.final_score, "final_length": self.final_length,
+                "won": self.won, "truncated": self.truncated}
+        return self.observations, self.rewards, self.dones, info
+
+    def snake(self, env):
+        """Body of one board as (x, y) cells, tail first, in SnakeEngine's coordinates."""
+        capacity = self.body.shape[1]
+        indices = (self.head_index[env] - np.arange(self.length[env])[::-1]) % capacity
+        return [self.cell_position(cell) for cell in self.body[env, indices]]
+
+    def cell_position(self, cell):
+        row, column = divmod(int(cell), self.columns)
+        return (self.left + column * self.segment_size, self.top - row * self.segment_size)
+
+
+def benchmark(envs, steps, width, height, seed=None):
+    env = SnakeVecEnv(envs, width, height, seed=seed)
+    env.reset()
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(len(ACTIONS), size=(steps, envs))
+    episodes = 0
+    food = 0.0
+    started = time.perf_counter()
+    for step_actions in actions:
+        observations, rewards, dones, info = env.step(step_actions)
+        episodes += int(dones.sum())
+        food += float(rewards.sum()) / 10
+    elapsed = time.perf_counter() - started
+    return {
+        "envs": envs,
+        "steps": steps,
+        "board": f"{width}x{height}",
+        "env_steps_per_sec": round(envs * steps / elapsed),
+        "step_us": round(elapsed / steps * 1e6, 3),
+        "episodes": episodes,
+        "food": int(food)
+    }
+
+
+def check(games, steps, width, height, seed=None):
+    """Play random games on one board and on a SnakeEngine side by side.
+
+    Food comes from different random streams, so the engine is handed the
+    board's food each time it is placed. Everything else (moves, crashes,
+    growth, score, the body and the observation) has to match at every tick.
+    """
+    rng = np.random.default_rng(seed)
+    mismatches = []
+    ticks = 0
+    for game in range(games):
+        game_seed = int(rng.integers(2**31))
+        env = SnakeVecEnv(1, width, height, seed=game_seed)
+        env.reset()
+        engine = SnakeEngine(width, height, seed=game_seed)
+        engine.food_pos = env.cell_position(env.food[0])
+        actions = np.random.default_rng(game_seed).integers(len(ACTIONS), size=steps)
+        for tick, action in enumerate(actions):
+            direction = ACTIONS[action]
+            if direction == OPPOSITES[engine.direction]:
+                direction = engine.direction
+            state = engine.step(direction)
+            observations, rewards, dones, info = env.step(np.array([action]))
+            ticks += 1
+            problem = None
+            if state.done != bool(dones[0]):
+                problem = f"done {bool(dones[0])}, engine {state.done}"
+            elif state.done:
+                if (info["final_score"][0], info["final_length"][0]) != (engine.score, len(engine.snake)):
+                    problem = "final score or length differs"
+            elif rewards[0] != (10 if state.ate else 0):
+                problem = f"reward {rewards[0]}, engine ate {state.ate}"
+            elif list(engine.snake) != env.snake(0):
+                problem = "body differs"
+            elif int(observations[0, BODY].sum()) != len(engine.snake):
+                problem = "body channel differs"
+            if problem:
+                mismatches.append({"game": game, "seed": game_seed, "tick": tick, "problem": problem})
+                break
+            if state.done:
+                break
+            if state.ate and env.food[0] >= 0:
+                engine.food_pos = env.cell_position(env.food[0])
+    return {
+        "board": f"{width}x{height}",
+        "games": games,
+        "ticks": ticks,
+        "mismatches": mismatches
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--envs", type=int, default=256)
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--board", metavar="WIDTHxHEIGHT", default=f"{WIDTH}x{HEIGHT}", help="in pixels, as in the game")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--check", type=int, metavar="GAMES",
+                        help="instead of timing, play GAMES games of up to --steps ticks against SnakeEngine")
+    args = parser.parse_args(argv)
+    width, height = map(int, args.board.split("x"))
+    if args.check:
+        result = check(args.check, args.steps, width, height, args.seed)
+        print(json.dumps(result, indent=2))
+        if result["mismatches"]:
+            sys.exit(f"{len(result['mismatches'])} of {args.check} games differ from SnakeEngine")
+        return
+    print(json.dumps(benchmark(args.envs, args.steps, width, height, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()